@@ -0,0 +1,252 @@
+import os
+import json
+import socket
+import struct
+import logging
+import itertools
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+DEFAULT_BUS_SOCKET = '/tmp/touchgesture-bus.sock'
+MAX_CONTROL_MESSAGE = 4096
+
+# Message kinds
+KIND_GESTURE = 1  # a gesture was recognized (one-shot, or start of a continuous one)
+KIND_UPDATE = 2   # per-frame delta of a continuous gesture, pixels
+KIND_END = 3      # continuous gesture released, velocity in pixels/s
+KIND_NAMES = {KIND_GESTURE: 'gesture', KIND_UPDATE: 'update', KIND_END: 'end'}
+
+VERSION = 1
+# version, kind, per-subscriber sequence, monotonic timestamp, x, y, action length; action follows
+HEADER = struct.Struct('<BBIdffB')
+
+
+def socket_mode(value: Any) -> int:
+    """Permission bits for the bus socket from the ``mode`` setting
+
+    YAML reads an unquoted ``0600`` as octal already; a quoted one arrives
+    as a string and is read as octal too, never as decimal 600.
+
+    Args:
+        value (Any): Configured mode, an int or an octal string such as "0660"
+
+    Returns:
+        int: Permission bits
+
+    Raises:
+        ValueError: If the value is not an int or an octal string within 0o777
+    """
+    if isinstance(value, str):
+        mode = int(value, 8)
+    elif isinstance(value, int) and not isinstance(value, bool):
+        mode = value
+    else:
+        raise ValueError(f"socket mode must be an octal number, not {value!r}")
+    if not 0 <= mode <= 0o777:
+        raise ValueError(f"socket mode {value!r} is outside 0000-0777")
+    return mode
+
+
+class BusEvent(NamedTuple):
+    kind: int
+    seq: int
+    timestamp: float
+    x: float
+    y: float
+    action: str
+
+
+def encode(kind: int, seq: int, timestamp: float, x: float, y: float, action: bytes) -> bytes:
+    return HEADER.pack(VERSION, kind, seq, timestamp, x, y, len(action)) + action
+
+
+def decode(data: bytes) -> BusEvent:
+    version, kind, seq, timestamp, x, y, length = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"Unsupported bus message version {version}")
+    action = data[HEADER.size:HEADER.size + length].decode()
+    return BusEvent(kind, seq, timestamp, x, y, action)
+
+
+def _address_name(address) -> str:
+    # Abstract-namespace addresses come back as bytes with a leading NUL; show them as ss(8) does
+    if isinstance(address, bytes):
+        return '@' + address.lstrip(b'\0').decode(errors='replace')
+    return address
+
+
+class _Subscriber:
+    __slots__ = ('address', 'kinds', 'actions', 'seq', 'sent', 'dropped')
+
+    def __init__(self, address, kinds: Optional[Iterable[int]], actions: Optional[Iterable[str]]):
+        self.address = address
+        self.kinds = frozenset(kinds) if kinds else None
+        self.actions = frozenset(actions) if actions else None
+        self.seq = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def wants(self, kind: int, action: str) -> bool:
+        return ((self.kinds is None or kind in self.kinds) and
+                (self.actions is None or action in self.actions))
+
+
+class GestureBus:
+    """Publish recognized gestures to local subscribers over Unix datagrams
+
+    A subscriber binds its own datagram socket and sends a JSON
+    ``{"subscribe": {"kinds": [...], "actions": [...]}}`` datagram to the
+    bus socket (both filters optional); ``{"unsubscribe": true}`` ends the
+    subscription. The socket is polled by the listener's select() like the
+    control socket.
+
+    Each event is one fixed-header binary datagram (see HEADER) sent with
+    MSG_DONTWAIT. A subscriber whose receive queue is full misses the event
+    and its drop counter grows; its per-subscriber sequence numbers show
+    the gap. Recognition never waits on a subscriber. A subscriber whose
+    socket is gone is removed.
+    """
+
+    def __init__(self, path: str, max_subscribers: int = 16, mode: int = 0o600):
+        self.path = path
+        self.max_subscribers = max_subscribers
+        self.subscribers: Dict[Any, _Subscriber] = {}  # keyed by socket address
+        self.published = 0
+        self.rejected = 0
+        if os.path.exists(path):
+            os.unlink(path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(path)
+        os.chmod(path, mode)
+        self.sock.setblocking(False)
+        logging.info(f"Gesture bus listening on {path}")
+
+    def handle_readable(self):
+        """Process pending subscription requests"""
+        while True:
+            try:
+                data, address = self.sock.recvfrom(MAX_CONTROL_MESSAGE)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logging.debug(f"Bus receive failed: {e}")
+                return
+            if not address:
+                # Unbound sender: there is nowhere to publish to
+                continue
+            try:
+                request = json.loads(data)
+            except ValueError:
+                logging.debug(f"Ignoring malformed bus request from {_address_name(address)}")
+                continue
+            self._handle_request(address, request)
+
+    def _handle_request(self, address, request: Dict[str, Any]):
+        if request.get('unsubscribe'):
+            if self.subscribers.pop(address, None) is not None:
+                logging.info(f"Bus subscriber {_address_name(address)} left")
+            return
+        filters = request.get('subscribe')
+        if filters is None:
+            return
+        if address not in self.subscribers and len(self.subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            logging.warning(f"Bus subscriber {_address_name(address)} rejected: {self.max_subscribers} already subscribed")
+            return
+        self.subscribers[address] = _Subscriber(address, filters.get('kinds'), filters.get('actions'))
+        logging.info(f"Bus subscriber {_address_name(address)} joined (kinds={filters.get('kinds')}, "
+                     f"actions={filters.get('actions')})")
+
+    def publish(self, kind: int, action: str, timestamp: float, x: float = 0.0, y: float = 0.0):
+        """Send one event to every interested subscriber without blocking"""
+        if not self.subscribers:
+            return
+        self.published += 1
+        name = action.encode()[:255]
+        for subscriber in tuple(self.subscribers.values()):
+            if not subscriber.wants(kind, action):
+                continue
+            subscriber.seq += 1
+            try:
+                self.sock.sendto(encode(kind, subscriber.seq, timestamp, x, y, name),
+                                 socket.MSG_DONTWAIT, subscriber.address)
+                subscriber.sent += 1
+            except (BlockingIOError, InterruptedError):
+                subscriber.dropped += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                del self.subscribers[subscriber.address]
+                logging.info(f"Bus subscriber {_address_name(subscriber.address)} went away")
+            except OSError as e:
+                subscriber.dropped += 1
+                logging.debug(f"Bus send to {_address_name(subscriber.address)} failed: {e}")
+
+    def close(self):
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'published': self.published,
+            'rejected': self.rejected,
+            'subscribers': {_address_name(address): {'sent': s.sent, 'dropped': s.dropped}
+                            for address, s in self.subscribers.items()},
+        }
+
+
+_client_ids = itertools.count()
+
+
+class BusSubscriber:
+    """Client side of the gesture bus
+
+    Binds an abstract-namespace datagram socket (nothing to clean up) and
+    subscribes with optional filters. Use recv() in a loop, or add the
+    object to a select()/poll() set via fileno()::
+
+        with BusSubscriber(kinds=[KIND_GESTURE]) as bus:
+            while True:
+                event = bus.recv()
+    """
+
+    def __init__(self, path: str = DEFAULT_BUS_SOCKET, kinds: Optional[Iterable[int]] = None,
+                 actions: Optional[Iterable[str]] = None, receive_buffer: Optional[int] = None):
+        self.path = path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        if receive_buffer:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        self.sock.bind(f"\0touchgesture-sub-{os.getpid()}-{next(_client_ids)}")
+        filters = {'kinds': list(kinds) if kinds else None, 'actions': list(actions) if actions else None}
+        self.sock.sendto(json.dumps({'subscribe': filters}).encode(), path)
+        self.last_seq = 0
+        self.missed = 0
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[BusEvent]:
+        """Wait for the next event; None on timeout"""
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(HEADER.size + 255)
+        except socket.timeout:
+            return None
+        event = decode(data)
+        if event.seq > self.last_seq + 1:
+            self.missed += event.seq - self.last_seq - 1
+        self.last_seq = event.seq
+        return event
+
+    def close(self):
+        try:
+            self.sock.sendto(json.dumps({'unsubscribe': True}).encode(), self.path)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,240 @@
+import os
+import re
+import shlex
+import signal
+import logging
+import subprocess
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+# Characters a shell would act on (anywhere, even inside a word); commands containing them keep /bin/sh
+SHELL_METACHARACTERS = frozenset(';|&<>()$`*?[]{}~#\n')
+# A leading NAME=value sets the environment of the command
+ENV_ASSIGNMENT = re.compile(r'[A-Za-z_][A-Za-z0-9_]*=')
+
+
+class CommandSpec:
+    """A command action parsed once at config load"""
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.command = config.get('command', '')
+        self.mode = config.get('mode', 'spawn')
+        self.timeout = float(config.get('timeout', 10))
+        self.max_concurrency = int(config.get('max_concurrency', 1))
+        self.input_template = config.get('input', '{action} {count}\n')
+        self.argv = self._parse(config)
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    def _parse(self, config: Dict[str, Any]) -> List[str]:
+        if config.get('shell', False):
+            return ['/bin/sh', '-c', self.command]
+        try:
+            argv = shlex.split(self.command)
+        except ValueError as e:
+            raise ValueError(f"Cannot parse command for action {self.name}: {e}")
+        # Quoted metacharacters also fall back: sh quotes the same way, it is only slower
+        if SHELL_METACHARACTERS.intersection(self.command) or (argv and ENV_ASSIGNMENT.match(argv[0])):
+            logging.warning(f"Action {self.name}: command uses shell syntax, running through /bin/sh "
+                            f"(set 'shell: true' to silence this warning)")
+            return ['/bin/sh', '-c', self.command]
+        return argv
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'started': self.started,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+            'rejected': self.rejected,
+        }
+
+
+class _Child:
+    __slots__ = ('pid', 'spec', 'deadline', 'killed_at')
+
+    def __init__(self, pid: int, spec: CommandSpec, deadline: float):
+        self.pid = pid
+        self.spec = spec
+        self.deadline = deadline
+        self.killed_at: Optional[float] = None
+
+
+class CommandRunner:
+    """Spawn command actions without a shell and reap them from the event loop
+
+    Commands run via os.posix_spawnp (vfork-style on Linux) in their own
+    session. Children are polled with waitpid(WNOHANG) from a scheduler tick
+    that only exists while children are alive, so the event thread never
+    blocks on them. Each command has a timeout (SIGTERM, then SIGKILL) and a
+    concurrency limit; triggers beyond the limit are rejected and counted.
+
+    With ``mode: coprocess`` the command is started once and each trigger
+    writes one line to its stdin instead of spawning a process.
+
+    When ``latency`` holds the loop's LatencyTuner, children are started
+    with the scheduling class and CPU mask of an ordinary process.
+    """
+
+    POLL_INTERVAL = 0.05
+    KILL_GRACE = 1.0
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.specs: Dict[str, CommandSpec] = {}
+        self.children: Dict[int, _Child] = {}
+        self.coprocesses: Dict[str, subprocess.Popen] = {}
+        # Coprocesses whose stdin broke: [proc, terminate_at, killed_at], reaped by _poll
+        self.retired: List[List[Any]] = []
+        self.poll_timer = None
+        self.base_env = dict(os.environ)
+        self.latency = None
+
+    def register(self, name: str, config: Dict[str, Any]) -> CommandSpec:
+        """Parse and register a command action"""
+        spec = CommandSpec(name, config)
+        self.specs[name] = spec
+        logging.debug(f"Registered command action {name}: argv={spec.argv}, mode={spec.mode}")
+        return spec
+
+    def run(self, name: str, count: int = 1):
+        """Execute a registered command action"""
+        spec = self.specs.get(name)
+        if spec is None or not spec.command:
+            return
+        if spec.mode == 'coprocess':
+            self._feed_coprocess(spec, spec.input_template.format(action=spec.name, count=count))
+        else:
+            self._spawn(spec, count)
+
+    def _running(self, spec: CommandSpec) -> int:
+        return sum(1 for child in self.children.values() if child.spec is spec)
+
+    def _spawn(self, spec: CommandSpec, count: int):
+        if self._running(spec) >= spec.max_concurrency:
+            spec.rejected += 1
+            logging.debug(f"Command {spec.name} rejected: {spec.max_concurrency} already running")
+            return
+        env = dict(self.base_env, TOUCHGESTURE_ACTION=spec.name, TOUCHGESTURE_COUNT=str(count))
+        options = {}
+        if self.latency is not None and self.latency.realtime_applied:
+            options['scheduler'] = self.latency.spawn_scheduler()
+        try:
+            with self.spawning():
+                pid = os.posix_spawnp(spec.argv[0], spec.argv, env, setsid=True, **options)
+        except OSError as e:
+            spec.failed += 1
+            logging.error(f"Failed to start command {spec.name}: {e}")
+            return
+        spec.started += 1
+        self.children[pid] = _Child(pid, spec, self.scheduler.now() + spec.timeout)
+        logging.debug(f"Started command {spec.name} (pid {pid})")
+        self._schedule_poll()
+
+    def spawning(self):
+        """Context to start a child in; see LatencyTuner.spawning"""
+        return self.latency.spawning() if self.latency is not None else nullcontext()
+
+    def _feed_coprocess(self, spec: CommandSpec, line: str):
+        proc = self.coprocesses.get(spec.name)
+        if proc is None or proc.poll() is not None:
+            try:
+                with self.spawning():
+                    proc = subprocess.Popen(spec.argv, stdin=subprocess.PIPE, start_new_session=True)
+            except OSError as e:
+                spec.failed += 1
+                logging.error(f"Failed to start coprocess {spec.name}: {e}")
+                return
+            os.set_blocking(proc.stdin.fileno(), False)
+            self.coprocesses[spec.name] = proc
+            spec.started += 1
+            logging.debug(f"Started coprocess {spec.name} (pid {proc.pid})")
+        try:
+            os.write(proc.stdin.fileno(), line.encode())
+            spec.completed += 1
+        except BlockingIOError:
+            # The coprocess is not keeping up; never stall the event loop on it
+            spec.rejected += 1
+        except BrokenPipeError:
+            spec.failed += 1
+            logging.warning(f"Coprocess {spec.name} closed its input, restarting on next trigger")
+            self._retire(spec.name, proc)
+
+    def _retire(self, name: str, proc: subprocess.Popen):
+        """Hand a coprocess that stopped reading to _poll instead of waiting for it here"""
+        del self.coprocesses[name]
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        if proc.poll() is None:
+            self.retired.append([proc, self.scheduler.now() + self.KILL_GRACE, None])
+            self._schedule_poll()
+
+    def _schedule_poll(self):
+        if self.poll_timer is None and (self.children or self.retired):
+            self.poll_timer = self.scheduler.call_later(self.POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        """Reap finished children and enforce timeouts"""
+        self.poll_timer = None
+        now = self.scheduler.now()
+        for pid, child in list(self.children.items()):
+            try:
+                done, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done, status = pid, 0
+            if done:
+                del self.children[pid]
+                if child.killed_at is None and os.waitstatus_to_exitcode(status) == 0:
+                    child.spec.completed += 1
+                elif child.killed_at is None:
+                    child.spec.failed += 1
+                    logging.debug(f"Command {child.spec.name} exited with status {os.waitstatus_to_exitcode(status)}")
+            elif child.killed_at is None and now >= child.deadline:
+                child.spec.timeouts += 1
+                child.killed_at = now
+                logging.warning(f"Command {child.spec.name} exceeded {child.spec.timeout}s timeout, terminating")
+                self._signal(child, signal.SIGTERM)
+            elif child.killed_at is not None and now - child.killed_at >= self.KILL_GRACE:
+                self._signal(child, signal.SIGKILL)
+        for retired in list(self.retired):
+            proc, terminate_at, killed_at = retired
+            if proc.poll() is not None:
+                self.retired.remove(retired)
+            elif killed_at is None and now >= terminate_at:
+                retired[2] = now
+                proc.terminate()
+            elif killed_at is not None and now - killed_at >= self.KILL_GRACE:
+                proc.kill()
+        self._schedule_poll()
+
+    def _signal(self, child: _Child, sig: int):
+        try:
+            os.killpg(child.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def close(self):
+        """Terminate coprocesses and any children still running"""
+        if self.poll_timer is not None:
+            self.poll_timer.cancel()
+            self.poll_timer = None
+        for proc in self.coprocesses.values():
+            if proc.poll() is None:
+                proc.stdin.close()
+                proc.terminate()
+        for child in self.children.values():
+            self._signal(child, signal.SIGTERM)
+        for proc, _, _ in self.retired:
+            proc.kill()
+        self.retired.clear()
+        self.coprocesses.clear()
+        self.children.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: spec.stats() for name, spec in self.specs.items()}
@@ -0,0 +1,152 @@
+import math
+import logging
+from typing import Any, Callable, Dict
+
+# X11 scroll buttons
+BUTTON_UP = 4
+BUTTON_DOWN = 5
+BUTTON_LEFT = 6
+BUTTON_RIGHT = 7
+
+
+class ScrollOutput:
+    """Turn a stream of scroll deltas into wheel clicks, one batch per display frame
+
+    Configured from a ``type: scroll`` entry in the ``actions:`` section:
+
+    - ``pixels_per_click``: finger travel per wheel click at slow speed
+    - ``acceleration`` / ``max_gain``: faster movement scales travel up by
+      ``1 + acceleration * speed / 1000`` (speed in pixels/s), at most ``max_gain``
+    - ``frame_rate``: output ticks per second; deltas arriving between ticks
+      are summed, so the backend is called at most once per axis per tick
+      whatever the input report rate
+    - ``max_clicks_per_frame``: clicks emitted per axis per tick; travel
+      beyond that is dropped (and counted) rather than queued
+    - ``natural``: content follows the fingers, as on phones
+    - ``kinetic``: after lift-off, keep scrolling at the release velocity,
+      decaying by ``exp(-friction * t)`` until below ``min_velocity`` pixels/s
+
+    ``emit(button, count)`` performs the clicks.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any], scheduler,
+                 emit: Callable[[int, int], None]):
+        self.name = name
+        self.scheduler = scheduler
+        self.emit = emit
+        self.pixels_per_click = float(config.get('pixels_per_click', 40))
+        self.acceleration = float(config.get('acceleration', 1.0))
+        self.max_gain = float(config.get('max_gain', 4.0))
+        self.frame_interval = 1.0 / float(config.get('frame_rate', 60))
+        self.max_clicks = int(config.get('max_clicks_per_frame', 4))
+        self.natural = config.get('natural', True)
+        self.horizontal = config.get('horizontal', True)
+        kinetic = config.get('kinetic') or {}
+        self.kinetic = kinetic.get('enabled', True)
+        self.friction = float(kinetic.get('friction', 4.0))
+        self.min_velocity = float(kinetic.get('min_velocity', 60))
+        self.pending_x = 0.0
+        self.pending_y = 0.0
+        self.remainder_x = 0.0
+        self.remainder_y = 0.0
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
+        self.coasting = False
+        self.tick_timer = None
+        self.last_tick = float('-inf')
+        self.updates = 0
+        self.frames = 0
+        self.clicks = 0
+        self.dropped_clicks = 0
+        self.kinetic_frames = 0
+
+    def begin(self):
+        """A new scroll started: stop any kinetic motion and start from zero"""
+        self.halt()
+        self.remainder_x = self.remainder_y = 0.0
+
+    def add(self, dx: float, dy: float):
+        """Accumulate one frame of finger movement (pixels)"""
+        self.updates += 1
+        self.pending_x += dx
+        self.pending_y += dy
+        self._schedule_tick()
+
+    def release(self, vx: float, vy: float):
+        """Fingers lifted with velocity (vx, vy) pixels/s: coast if fast enough"""
+        if self.kinetic and math.hypot(vx, vy) >= self.min_velocity:
+            self.velocity_x, self.velocity_y = vx, vy
+            self.coasting = True
+            self._schedule_tick()
+
+    def halt(self):
+        """Stop kinetic scrolling, e.g. when a finger touches the screen again"""
+        self.coasting = False
+        self.velocity_x = self.velocity_y = 0.0
+
+    def _schedule_tick(self):
+        if self.tick_timer is None:
+            # The first delta after a pause goes out at once, later ones on the frame grid
+            deadline = max(self.scheduler.now(), self.last_tick + self.frame_interval)
+            self.tick_timer = self.scheduler.call_at(deadline, self._tick)
+
+    def _tick(self):
+        self.tick_timer = None
+        now = self.scheduler.now()
+        dt = max(now - self.last_tick, 1e-6)
+        self.last_tick = now
+        dx, dy = self.pending_x, self.pending_y
+        self.pending_x = self.pending_y = 0.0
+        if self.coasting:
+            self.kinetic_frames += 1
+            coast = min(dt, 2 * self.frame_interval)
+            dx += self.velocity_x * coast
+            dy += self.velocity_y * coast
+            decay = math.exp(-self.friction * coast)
+            self.velocity_x *= decay
+            self.velocity_y *= decay
+            if math.hypot(self.velocity_x, self.velocity_y) < self.min_velocity:
+                self.halt()
+        if dx or dy:
+            self.frames += 1
+            gain = min(self.max_gain, 1.0 + self.acceleration * math.hypot(dx, dy) / dt / 1000.0)
+            # Natural scrolling: fingers moving up scroll the view down
+            sign = -1.0 if self.natural else 1.0
+            self.remainder_y = self._emit_axis(self.remainder_y + sign * dy * gain, BUTTON_DOWN, BUTTON_UP)
+            if self.horizontal:
+                self.remainder_x = self._emit_axis(self.remainder_x + sign * dx * gain, BUTTON_RIGHT, BUTTON_LEFT)
+        if self.coasting:
+            self._schedule_tick()
+
+    def _emit_axis(self, amount: float, positive: int, negative: int) -> float:
+        """Emit the whole clicks in amount; return the travel carried to the next tick"""
+        clicks = int(amount / self.pixels_per_click)
+        if clicks == 0:
+            return amount
+        amount -= clicks * self.pixels_per_click
+        if abs(clicks) > self.max_clicks:
+            self.dropped_clicks += abs(clicks) - self.max_clicks
+            clicks = self.max_clicks if clicks > 0 else -self.max_clicks
+        self.clicks += abs(clicks)
+        try:
+            self.emit(positive if clicks > 0 else negative, abs(clicks))
+        except Exception as e:
+            logging.error(f"Error emitting scroll for {self.name}: {e}")
+        return amount
+
+    def cancel(self):
+        """Drop pending motion and stop ticking"""
+        if self.tick_timer is not None:
+            self.tick_timer.cancel()
+            self.tick_timer = None
+        self.halt()
+        self.pending_x = self.pending_y = 0.0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'updates': self.updates,
+            'frames': self.frames,
+            'clicks': self.clicks,
+            'dropped_clicks': self.dropped_clicks,
+            'kinetic_frames': self.kinetic_frames,
+        }
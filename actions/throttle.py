@@ -0,0 +1,103 @@
+import logging
+from typing import Any, Callable, Dict
+
+
+class ActionThrottle:
+    """Debounce, rate-limit and coalesce triggers of a single action
+
+    Configured from the action's entry in the ``actions:`` section:
+
+    - ``min_interval``: minimum seconds between two executions
+    - ``rate`` / ``burst``: token bucket refilled at ``rate`` executions per
+      second, holding at most ``burst`` tokens
+    - ``coalesce``: window in seconds; the first trigger runs immediately
+      and every further trigger inside the window is merged into a single
+      execution at the end of the window, carrying the merged count
+
+    Counters satisfy ``triggered == executed + merged + dropped + pending``,
+    where ``merged`` counts triggers folded into another execution.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any], scheduler,
+                 execute: Callable[[str, int], None]):
+        self.name = name
+        self.scheduler = scheduler
+        self.execute = execute
+        self.min_interval = float(config.get('min_interval', 0))
+        self.rate = float(config.get('rate', 0))
+        self.burst = float(config.get('burst', max(1.0, self.rate)))
+        self.coalesce = float(config.get('coalesce', 0))
+        self.tokens = self.burst
+        self.last_refill = None
+        self.last_run = None
+        self.pending = 0
+        self.flush_timer = None
+        self.triggered = 0
+        self.executed = 0
+        self.merged = 0
+        self.dropped = 0
+
+    def submit(self):
+        """Register one trigger of the action"""
+        self.triggered += 1
+        if self.flush_timer is not None:
+            # Inside a coalescing window: fold into the trailing execution
+            self.pending += 1
+            return
+        self._run(1)
+        self._open_window()
+
+    def _open_window(self):
+        if self.coalesce > 0:
+            self.flush_timer = self.scheduler.call_later(self.coalesce, self._flush)
+
+    def _flush(self):
+        self.flush_timer = None
+        if self.pending:
+            count = self.pending
+            self.pending = 0
+            self._run(count)
+            # Keep coalescing while triggers keep arriving
+            self._open_window()
+
+    def _allow(self, now: float) -> bool:
+        if self.min_interval > 0 and self.last_run is not None:
+            if now - self.last_run < self.min_interval:
+                return False
+        if self.rate > 0:
+            if self.last_refill is not None:
+                elapsed = now - self.last_refill
+                self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+        return True
+
+    def _run(self, count: int):
+        now = self.scheduler.now()
+        if not self._allow(now):
+            self.dropped += count
+            logging.debug(f"Action {self.name} throttled, dropped {count} trigger(s)")
+            return
+        self.last_run = now
+        self.executed += 1
+        self.merged += count - 1
+        self.execute(self.name, count)
+
+    def cancel(self):
+        """Discard any pending coalesced triggers"""
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        self.dropped += self.pending
+        self.pending = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'triggered': self.triggered,
+            'executed': self.executed,
+            'merged': self.merged,
+            'dropped': self.dropped,
+            'pending': self.pending,
+        }
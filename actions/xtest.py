@@ -0,0 +1,33 @@
+import logging
+
+
+class XTestPointer:
+    """Wheel clicks through the X server's XTEST extension on one persistent connection
+
+    Every batch of clicks is flushed to the server as soon as it is
+    written, so a scroll tick takes effect immediately. A line-based
+    helper such as ``xdotool -`` would not do: in script mode it reads
+    stdin to EOF before running anything.
+    """
+
+    def __init__(self):
+        # python-xlib is only needed once a scroll action is configured on a live display
+        from Xlib import X, display
+        from Xlib.ext import xtest
+        self._press, self._release = X.ButtonPress, X.ButtonRelease
+        self._fake_input = xtest.fake_input
+        self.display = display.Display()
+        if not self.display.has_extension('XTEST'):
+            self.display.close()
+            raise RuntimeError("X server has no XTEST extension")
+        logging.debug(f"XTEST pointer on display {self.display.get_display_name()}")
+
+    def click(self, button: int, count: int = 1):
+        """Press and release a pointer button count times, then flush"""
+        for _ in range(count):
+            self._fake_input(self.display, self._press, button)
+            self._fake_input(self.display, self._release, button)
+        self.display.flush()
+
+    def close(self):
+        self.display.close()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.streams import SCENARIOS
+from gestures.hold import HoldGesture
+from gestures.pinch import PinchGesture
+from input.listener import InputListener
+from utils.clock import Scheduler, VirtualClock
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+HOLD_CONFIG = {'enabled': True, 'fingers': 2, 'duration': 0.5, 'movement_tolerance': 20, 'action': 'hold'}
+PINCH_CONFIG = {'enabled': True, 'threshold': 50, 'action': 'pinch'}
+PIPELINE_CONFIG = {
+    'devices': [],
+    'gestures': {'hold': HOLD_CONFIG, 'pinch': PINCH_CONFIG},
+    'actions': {},
+    'conditioning': {'enabled': True, 'deadband': 2, 'dedup': True},
+    'control': {'enabled': False},
+    'debug': {'log_file': None},
+}
+
+# Regressions are flagged when a metric exceeds its baseline by more than this
+DEFAULT_TOLERANCE = 0.30
+BLOCK_SLACK = 0.05  # allocated blocks/event
+TRANSIENT_SLACK = 16  # transient bytes/event
+
+
+class Target(ABC):
+    """One thing under benchmark, rebuilt fresh for every run"""
+
+    def __init__(self):
+        self.detections: List[float] = []
+        self.scheduler = Scheduler(VirtualClock())
+
+    @abstractmethod
+    def feed(self, events):
+        """Run the events through the target in virtual time"""
+        pass
+
+    def finish(self):
+        """Let timers armed by the final events expire"""
+        deadline = self.scheduler.next_deadline()
+        while deadline is not None:
+            self.scheduler.run_until(deadline)
+            deadline = self.scheduler.next_deadline()
+
+
+class GestureTarget(Target):
+    def __init__(self, gesture_class, config):
+        super().__init__()
+        self.gesture = gesture_class(config)
+        self.gesture.set_scheduler(self.scheduler)
+        self.gesture.set_gesture_callback(lambda action: self.detections.append(self.scheduler.now()))
+
+    def feed(self, events):
+        scheduler = self.scheduler
+        process = self.gesture.process_event
+        for event in events:
+            scheduler.run_until(event.timestamp())
+            process(event.type, event.code, event.value)
+
+
+class PipelineTarget(Target):
+    config_path: Optional[str] = None
+
+    def __init__(self):
+        super().__init__()
+        self.listener = InputListener(self.config_path, replay=True)
+        self.scheduler = self.listener.scheduler
+        # Measure recognition, not xdotool: record when an action would run
+        self.listener._trigger_action = lambda name, count=1: self.detections.append(self.scheduler.now())
+
+    def feed(self, events):
+        scheduler = self.scheduler
+        process = self.listener._process_event
+        for event in events:
+            scheduler.run_until(event.timestamp())
+            process(event)
+
+
+TARGETS: Dict[str, Callable[[], Target]] = {
+    'hold': lambda: GestureTarget(HoldGesture, HOLD_CONFIG),
+    'pinch': lambda: GestureTarget(PinchGesture, PINCH_CONFIG),
+    'pipeline': PipelineTarget,
+}
+
+
+def measure(make_target: Callable[[], Target], events: list, repeats: int) -> Dict[str, Any]:
+    """Time, allocation and detection metrics for one target on one stream"""
+    best = None
+    for _ in range(repeats):
+        target = make_target()
+        # Like timeit: keep garbage from earlier cases from being collected mid-run
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter_ns()
+            target.feed(events)
+            target.finish()
+            elapsed = time.perf_counter_ns() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Allocations are counted event by event, so objects created for one
+    # event and freed during a later one still count against the event
+    # that created them. Objects freed before their own event returns are
+    # caught by the transient high-water mark instead.
+    batches = [(event,) for event in events]
+    target = make_target()
+    allocated_blocks = 0
+    gc.disable()
+    try:
+        for batch in batches:
+            before = sys.getallocatedblocks()
+            target.feed(batch)
+            allocated_blocks += max(0, sys.getallocatedblocks() - before)
+        target.finish()
+    finally:
+        gc.enable()
+
+    target = make_target()
+    transient = 0
+    tracemalloc.start()
+    for batch in batches:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        target.feed(batch)
+        transient += tracemalloc.get_traced_memory()[1] - current
+    target.finish()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = events[0].timestamp()
+    return {
+        'ns_per_event': round(best / len(events), 1),
+        'alloc_blocks_per_event': round(allocated_blocks / len(events), 4),
+        'transient_bytes_per_event': round(transient / len(events), 1),
+        'peak_kib': round(peak / 1024, 1),
+        'detections': len(target.detections),
+        'latency': round(target.detections[0] - start, 6) if target.detections else None,
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baselines: Dict[str, Dict[str, Any]],
+            tolerance: float) -> List[str]:
+    """Return a description of every metric that regressed against its baseline"""
+    regressions = []
+    for key, metrics in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        if metrics['ns_per_event'] > baseline['ns_per_event'] * (1 + tolerance):
+            regressions.append(f"{key}: {metrics['ns_per_event']} ns/event > baseline {baseline['ns_per_event']}")
+        if metrics['alloc_blocks_per_event'] > baseline['alloc_blocks_per_event'] + BLOCK_SLACK:
+            regressions.append(f"{key}: {metrics['alloc_blocks_per_event']} allocated blocks/event "
+                               f"> baseline {baseline['alloc_blocks_per_event']}")
+        if metrics['transient_bytes_per_event'] > baseline['transient_bytes_per_event'] + TRANSIENT_SLACK:
+            regressions.append(f"{key}: {metrics['transient_bytes_per_event']} transient bytes/event "
+                               f"> baseline {baseline['transient_bytes_per_event']}")
+        # Virtual time makes detection exact: any change is a behaviour change
+        if metrics['detections'] != baseline['detections'] or metrics['latency'] != baseline['latency']:
+            regressions.append(f"{key}: detections={metrics['detections']} latency={metrics['latency']} "
+                               f"!= baseline detections={baseline['detections']} latency={baseline['latency']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TouchGesture - Recognizer benchmarks')
+    parser.add_argument('--repeats', '-r', type=int, default=5, help='Timed runs per case (best is kept)')
+    parser.add_argument('--tolerance', '-t', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown before flagging a regression (0.3 = 30%%)')
+    parser.add_argument('--filter', '-k', help='Only run cases whose name contains this string')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baselines')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline file')
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        # JSON is valid YAML, so the listener's loader reads it unchanged
+        json.dump(PIPELINE_CONFIG, f)
+        PipelineTarget.config_path = f.name
+    logging.disable(logging.WARNING)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for scenario, make_events in SCENARIOS.items():
+            events = make_events()
+            for target_name, make_target in TARGETS.items():
+                key = f"{scenario}/{target_name}"
+                if args.filter and args.filter not in key:
+                    continue
+                results[key] = measure(make_target, events, args.repeats)
+    finally:
+        os.unlink(PipelineTarget.config_path)
+        logging.disable(logging.NOTSET)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    print(f"{'case':<24} {'ns/event':>10} {'base':>10} {'blocks/ev':>10} {'bytes/ev':>9} {'peak KiB':>9} "
+          f"{'det':>4} {'latency':>9}")
+    for key, metrics in results.items():
+        base = baselines.get(key, {}).get('ns_per_event', '-')
+        latency = '-' if metrics['latency'] is None else f"{metrics['latency']:.3f}"
+        print(f"{key:<24} {metrics['ns_per_event']:>10} {base:>10} {metrics['alloc_blocks_per_event']:>10} "
+              f"{metrics['transient_bytes_per_event']:>9} {metrics['peak_kib']:>9} {metrics['detections']:>4} "
+              f"{latency:>9}")
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baselines written to {args.baseline}")
+        return
+
+    regressions = compare(results, baselines, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+if __name__ == '__main__':
+    main()
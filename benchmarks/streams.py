@@ -0,0 +1,95 @@
+import math
+import random
+from typing import List, Tuple
+from utils.capture import CaptureEvent
+
+EV_SYN = 0
+EV_ABS = 3
+ABS_MT_SLOT = 47
+ABS_MT_POSITION_X = 53
+ABS_MT_POSITION_Y = 54
+ABS_MT_TRACKING_ID = 57
+
+START = 1000.0
+
+
+def _event(timestamp: float, event_type: int, code: int, value: int) -> CaptureEvent:
+    sec = int(timestamp)
+    return CaptureEvent(sec, int(round((timestamp - sec) * 1000000)), event_type, code, value)
+
+
+class _Stream:
+    """Builds a kernel-style MT event stream frame by frame"""
+
+    def __init__(self):
+        self.events: List[CaptureEvent] = []
+        self.next_id = 1
+
+    def frame(self, timestamp: float, contacts: List[Tuple[int, str, int, int]]):
+        """contacts: (slot, 'down'|'move'|'up', x, y)"""
+        for slot, kind, x, y in contacts:
+            self.events.append(_event(timestamp, EV_ABS, ABS_MT_SLOT, slot))
+            if kind == 'down':
+                self.events.append(_event(timestamp, EV_ABS, ABS_MT_TRACKING_ID, self.next_id))
+                self.next_id += 1
+            elif kind == 'up':
+                self.events.append(_event(timestamp, EV_ABS, ABS_MT_TRACKING_ID, -1))
+                continue
+            self.events.append(_event(timestamp, EV_ABS, ABS_MT_POSITION_X, x))
+            self.events.append(_event(timestamp, EV_ABS, ABS_MT_POSITION_Y, y))
+        self.events.append(_event(timestamp, EV_SYN, 0, 0))
+
+
+def idle_rest(seconds: float = 10.0, rate: int = 120) -> List[CaptureEvent]:
+    """One finger resting on the panel, reporting sub-pixel sensor noise"""
+    rng = random.Random(1)
+    stream = _Stream()
+    stream.frame(START, [(0, 'down', 1000, 1000)])
+    for i in range(1, int(seconds * rate)):
+        stream.frame(START + i / rate, [(0, 'move', 1000 + rng.randint(-1, 1), 1000 + rng.randint(-1, 1))])
+    stream.frame(START + seconds, [(0, 'up', 0, 0)])
+    return stream.events
+
+
+def storm(fingers: int = 10, seconds: float = 2.0, rate: int = 240) -> List[CaptureEvent]:
+    """Ten fingers all moving on every frame"""
+    stream = _Stream()
+    stream.frame(START, [(slot, 'down', 200 + slot * 300, 1000) for slot in range(fingers)])
+    for i in range(1, int(seconds * rate)):
+        t = i / rate
+        stream.frame(START + t, [(slot, 'move', 200 + slot * 300 + int(400 * math.sin(t + slot)),
+                                  1000 + int(400 * math.cos(t * 2 + slot))) for slot in range(fingers)])
+    stream.frame(START + seconds, [(slot, 'up', 0, 0) for slot in range(fingers)])
+    return stream.events
+
+
+def pinch(seconds: float = 0.5, rate: int = 120, spread: int = 600) -> List[CaptureEvent]:
+    """Two fingers moving apart symmetrically"""
+    stream = _Stream()
+    stream.frame(START, [(0, 'down', 1500, 1500), (1, 'down', 1700, 1500)])
+    steps = int(seconds * rate)
+    for i in range(1, steps):
+        offset = spread * i // steps // 2
+        stream.frame(START + i / rate, [(0, 'move', 1500 - offset, 1500), (1, 'move', 1700 + offset, 1500)])
+    stream.frame(START + seconds, [(0, 'up', 0, 0), (1, 'up', 0, 0)])
+    return stream.events
+
+
+def long_hold(seconds: float = 3.0, rate: int = 120) -> List[CaptureEvent]:
+    """Two fingers held still (with sensor noise) well past the hold duration"""
+    rng = random.Random(2)
+    stream = _Stream()
+    stream.frame(START, [(0, 'down', 1000, 1000), (1, 'down', 1400, 1000)])
+    for i in range(1, int(seconds * rate)):
+        stream.frame(START + i / rate, [(0, 'move', 1000 + rng.randint(-2, 2), 1000 + rng.randint(-2, 2)),
+                                        (1, 'move', 1400 + rng.randint(-2, 2), 1000 + rng.randint(-2, 2))])
+    stream.frame(START + seconds, [(0, 'up', 0, 0), (1, 'up', 0, 0)])
+    return stream.events
+
+
+SCENARIOS = {
+    'idle_rest': idle_rest,
+    'storm_10': storm,
+    'pinch': pinch,
+    'long_hold': long_hold,
+}
@@ -0,0 +1,128 @@
+import logging
+from typing import Callable, Dict, List, Optional
+from .base import Gesture, ContinuousGesture, STATE_POSSIBLE, STATE_FAILED
+
+
+class GestureArbiter:
+    """Decide which recognizer owns a touch sequence
+
+    A touch sequence runs from the first finger down to the last finger up.
+    Recognizers are dispatched in descending ``priority`` order. A recognizer
+    that reports STATE_FAILED is removed from dispatch for the rest of the
+    sequence. The first recognizer of an exclusivity ``group`` to begin wins:
+    every other member of that group is reset and removed, so it neither
+    spends CPU on the touch nor fires a second action for it. Gestures in
+    different groups do not compete. Updates of continuous gestures are
+    forwarded only while the gesture still owns the sequence.
+
+    Gestures bound to screen regions are only armed for sequences whose
+    first touch lands in one of their regions (see arm()).
+    """
+
+    def __init__(self):
+        self.gestures: List[Gesture] = []
+        self.active: List[Gesture] = []
+        self.stage_names: Dict[Gesture, str] = {}
+        self.callback: Optional[Callable[[str], None]] = None
+        self.update_callback: Optional[Callable[[str, str, float, float], None]] = None
+        self.failed = 0
+        self.cancelled = 0
+        self.suppressed = 0
+        self.unarmed = 0
+        # Gestures not armed for the current sequence; they never see its events
+        self.idle: List[Gesture] = []
+
+    def set_callback(self, callback: Callable[[str], None]):
+        """Set the function receiving actions of winning recognizers"""
+        self.callback = callback
+
+    def set_update_callback(self, callback: Callable[[str, str, float, float], None]):
+        """Set the function receiving (action, phase, x, y) of continuous gestures"""
+        self.update_callback = callback
+
+    def add(self, gesture: Gesture):
+        """Register a recognizer; its triggers are routed through the arbiter"""
+        gesture.set_gesture_callback(lambda action, gesture=gesture: self._on_trigger(gesture, action))
+        if isinstance(gesture, ContinuousGesture):
+            gesture.set_update_callback(
+                lambda action, phase, x, y, gesture=gesture: self._on_update(gesture, action, phase, x, y))
+        self.gestures.append(gesture)
+        # Stable sort keeps config order among equal priorities
+        self.gestures.sort(key=lambda g: -g.priority)
+        self.active = list(self.gestures)
+        self.stage_names[gesture] = f"recognizer:{gesture.name}"
+
+    def dispatch(self, event_type: int, event_code: int, event_value: int, profiler=None):
+        """Feed one event to every recognizer still in the running"""
+        for gesture in tuple(self.active):
+            if gesture not in self.active:
+                # Cancelled by a competitor earlier in this dispatch
+                continue
+            if profiler is not None:
+                started = profiler.start()
+                gesture.process_event(event_type, event_code, event_value)
+                profiler.stop(self.stage_names[gesture], started)
+            else:
+                gesture.process_event(event_type, event_code, event_value)
+            if gesture.state == STATE_FAILED:
+                self.active.remove(gesture)
+                self.failed += 1
+                logging.debug(f"Arbiter - {gesture.name} failed, removed from dispatch")
+
+    def _on_trigger(self, gesture: Gesture, action: str):
+        if gesture in self.idle:
+            # A deadline left over from an earlier sequence (e.g. a pending tap):
+            # it does not compete for this one
+            if self.callback:
+                self.callback(action)
+            return
+        if gesture not in self.active:
+            # A timer fired for a recognizer that already lost this sequence
+            self.suppressed += 1
+            logging.debug(f"Arbiter - Suppressed {gesture.name}: no longer in the running")
+            return
+        for other in tuple(self.active):
+            if other is not gesture and other.group == gesture.group:
+                other.reset()
+                self.active.remove(other)
+                self.cancelled += 1
+                logging.debug(f"Arbiter - {gesture.name} won, cancelled {other.name}")
+        if self.callback:
+            self.callback(action)
+
+    def _on_update(self, gesture: Gesture, action: str, phase: str, x: float, y: float):
+        if gesture in self.active and self.update_callback:
+            self.update_callback(action, phase, x, y)
+
+    def arm(self, regions):
+        """Start of a sequence inside the given regions: drop gestures bound elsewhere"""
+        hit = frozenset(regions)
+        armed = [g for g in self.active if not g.regions or g.regions & hit]
+        self.idle = [g for g in self.active if g not in armed]
+        self.unarmed += len(self.idle)
+        self.active = armed
+
+    def end_sequence(self):
+        """All fingers lifted: reset losers and re-arm every recognizer"""
+        for gesture in self.gestures:
+            if gesture in self.idle:
+                continue
+            if gesture not in self.active or gesture.state != STATE_POSSIBLE:
+                gesture.reset()
+        self.active = list(self.gestures)
+        self.idle = []
+
+    def reset(self):
+        """Abandon the current sequence: reset every recognizer and re-arm all of them"""
+        for gesture in self.gestures:
+            gesture.reset()
+        self.active = list(self.gestures)
+        self.idle = []
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'suppressed': self.suppressed,
+            'unarmed': self.unarmed,
+        }
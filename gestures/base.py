@@ -1,29 +1,66 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Callable, Optional
-import time
 import logging
+from utils.clock import Scheduler
+
+# Recognizer states used by the arbiter for the current touch sequence
+STATE_POSSIBLE = 'possible'  # still evaluating the touch
+STATE_BEGAN = 'began'        # recognized; competitors in the same group are cancelled
+STATE_FAILED = 'failed'      # cannot match this touch; skipped until all fingers lift
+
+DEFAULT_GROUP = 'touch'
+
+# Phases reported by continuous gestures after they begin
+PHASE_UPDATE = 'update'  # per-frame delta in pixels
+PHASE_END = 'end'        # fingers lifted; carries the release velocity in pixels/s
 
 class Gesture(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.enabled = config.get('enabled', True)
         self.action = config.get('action')
+        self.priority = config.get('priority', 0)
+        self.group = config.get('group', DEFAULT_GROUP)
+        # Names of the screen regions the touch must start in; empty means anywhere
+        regions = config.get('regions', config.get('region'))
+        self.regions = frozenset([regions] if isinstance(regions, str) else regions or ())
+        self.state = STATE_POSSIBLE
         self.touch_points: List[Dict[str, float]] = []
         self.start_time = 0
         self.is_active = False
         self.name = self.__class__.__name__
         self.gesture_callback: Optional[Callable[[str], None]] = None
+        self.scheduler = Scheduler()
         logging.debug(f"{self.name} initialized with config: {config}")
 
     def set_gesture_callback(self, callback: Callable[[str], None]):
         """Set the callback function to notify when gesture is detected"""
         self.gesture_callback = callback
 
-    def trigger_gesture(self):
-        """Notify the listener that this gesture has been detected"""
-        if self.gesture_callback and self.action:
-            logging.debug(f"{self.name} - Triggering gesture callback for action: {self.action}")
-            self.gesture_callback(self.action)
+    def set_scheduler(self, scheduler: Scheduler):
+        """Share the listener's clock and timer queue with this gesture"""
+        self.scheduler = scheduler
+
+    def now(self) -> float:
+        """Current time on the gesture's clock (monotonic or virtual)"""
+        return self.scheduler.now()
+
+    def trigger_gesture(self, action: Optional[str] = None):
+        """Notify the listener that this gesture has been detected
+
+        Gestures with several bindings pass the matched one's action.
+        """
+        self.state = STATE_BEGAN
+        action = action or self.action
+        if self.gesture_callback and action:
+            logging.debug(f"{self.name} - Triggering gesture callback for action: {action}")
+            self.gesture_callback(action)
+
+    def fail(self, reason: str = ''):
+        """Declare that this touch sequence cannot be this gesture"""
+        if self.state != STATE_FAILED:
+            self.state = STATE_FAILED
+            logging.debug(f"{self.name} - Failed: {reason}")
 
     @abstractmethod
     def process_event(self, event_type: int, event_code: int, event_value: int) -> bool:
@@ -37,6 +74,7 @@ class Gesture(ABC):
         self.touch_points = []
         self.start_time = 0
         self.is_active = False
+        self.state = STATE_POSSIBLE
         logging.debug(f"{self.name} - Reset complete")
 
     def get_touch_point(self, slot: int) -> Dict[str, float]:
@@ -68,4 +106,31 @@ class Gesture(ABC):
     def log_detection(self, **details):
         """Log gesture detection with details"""
         details_str = ", ".join(f"{k}={v}" for k, v in details.items())
-        logging.info(f"{self.name} DETECTED! {details_str}") 
\ No newline at end of file
+        logging.info(f"{self.name} DETECTED! {details_str}")
+
+
+class ContinuousGesture(Gesture):
+    """Gesture that keeps reporting after it is recognized
+
+    Recognition still goes through trigger_gesture(), so arbitration is the
+    same as for one-shot gestures. Afterwards every frame is reported with
+    update_gesture() and the release with end_gesture().
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.update_callback: Optional[Callable[[str, str, float, float], None]] = None
+
+    def set_update_callback(self, callback: Callable[[str, str, float, float], None]):
+        """Set the function receiving (action, phase, x, y) after recognition"""
+        self.update_callback = callback
+
+    def update_gesture(self, dx: float, dy: float):
+        """Report the movement of one frame"""
+        if self.update_callback and self.action:
+            self.update_callback(self.action, PHASE_UPDATE, dx, dy)
+
+    def end_gesture(self, vx: float, vy: float):
+        """Report the end of the gesture with the release velocity"""
+        if self.update_callback and self.action:
+            self.update_callback(self.action, PHASE_END, vx, vy)
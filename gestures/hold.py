@@ -1,7 +1,5 @@
 from .base import Gesture
-import time
 import logging
-import threading
 
 class HoldGesture(Gesture):
     def __init__(self, config):
@@ -11,7 +9,6 @@ class HoldGesture(Gesture):
         self.movement_tolerance = config.get('movement_tolerance', 20)  # pixels
         self.current_fingers = 0
         self.hold_timer = None
-        self.hold_timer_lock = threading.Lock()
         self.gesture_triggered = False
         self.finger_positions = {}  # Dictionary to track each finger's position
         self.current_slot = 0  # Current touch slot being updated
@@ -32,43 +29,44 @@ class HoldGesture(Gesture):
         return max_distance
 
     def start_hold_timer(self):
-        with self.hold_timer_lock:
-            if self.hold_timer is None:
-                self.hold_timer = threading.Timer(self.required_duration, self.check_hold_duration)
-                self.hold_timer.start()
-                logging.debug(f"{self.name} - Started hold timer for {self.required_duration}s")
+        if self.hold_timer is None:
+            self.hold_timer = self.scheduler.call_later(self.required_duration, self.check_hold_duration)
+            logging.debug(f"{self.name} - Started hold timer for {self.required_duration}s")
 
     def stop_hold_timer(self):
-        with self.hold_timer_lock:
-            if self.hold_timer is not None:
-                self.hold_timer.cancel()
-                self.hold_timer = None
-                logging.debug(f"{self.name} - Stopped hold timer")
+        if self.hold_timer is not None:
+            self.hold_timer.cancel()
+            self.hold_timer = None
+            logging.debug(f"{self.name} - Stopped hold timer")
 
     def check_hold_duration(self):
-        with self.hold_timer_lock:
-            if (self.current_fingers == self.required_fingers and 
-                not self.is_active and not self.gesture_triggered):
-                
-                # Check if movement exceeds tolerance
-                movement_distance = self.calculate_max_movement_distance()
-                if movement_distance > self.movement_tolerance:
-                    logging.debug(f"{self.name} - Hold cancelled: max movement {movement_distance:.1f}px > {self.movement_tolerance}px tolerance")
-                    self.stop_hold_timer()
-                    return False
-                
-                hold_time = time.time() - self.start_time
-                if hold_time >= self.required_duration:
-                    logging.info(f"{self.name} - ❤️ - Hold duration met: {hold_time:.2f}s (max movement: {movement_distance:.1f}px, fingers: {self.current_fingers})")
-                    self.log_detection(duration=f"{hold_time:.2f}s", fingers=self.current_fingers, movement=f"{movement_distance:.1f}px")
-                    self.is_active = True
-                    self.gesture_triggered = True
-                    logging.debug(f"{self.name} - Gesture active, will trigger action: {self.action}")
-                    # Trigger the gesture immediately via callback
-                    self.trigger_gesture()
-                    # Clear start_time after successful gesture to prevent race conditions
-                    self.start_time = None
-                    return True
+        # The timer has fired; it must be re-armed explicitly
+        self.hold_timer = None
+        if (self.current_fingers == self.required_fingers and
+            not self.is_active and not self.gesture_triggered and self.start_time is not None):
+
+            # Check if movement exceeds tolerance
+            movement_distance = self.calculate_max_movement_distance()
+            if movement_distance > self.movement_tolerance:
+                logging.debug(f"{self.name} - Hold cancelled: max movement {movement_distance:.1f}px > {self.movement_tolerance}px tolerance")
+                self.fail("moved beyond tolerance")
+                return False
+
+            now = self.now()
+            # Compare against the deadline rather than the difference so float
+            # rounding cannot reject a timer firing exactly on time
+            if now >= self.start_time + self.required_duration:
+                hold_time = now - self.start_time
+                logging.info(f"{self.name} - ❤️ - Hold duration met: {hold_time:.2f}s (max movement: {movement_distance:.1f}px, fingers: {self.current_fingers})")
+                self.log_detection(duration=f"{hold_time:.2f}s", fingers=self.current_fingers, movement=f"{movement_distance:.1f}px")
+                self.is_active = True
+                self.gesture_triggered = True
+                logging.debug(f"{self.name} - Gesture active, will trigger action: {self.action}")
+                # Trigger the gesture immediately via callback
+                self.trigger_gesture()
+                # Clear start_time after successful gesture to prevent race conditions
+                self.start_time = None
+                return True
         return False
 
     def process_event(self, event_type: int, event_code: int, event_value: int) -> bool:
@@ -116,13 +114,14 @@ class HoldGesture(Gesture):
                 
                 # Start timer when we have the required number of fingers
                 if self.current_fingers == self.required_fingers:
-                    self.start_time = time.time()
+                    self.start_time = self.now()
                     logging.debug(f"{self.name} - Required fingers reached, starting hold timer...")
                     self.start_hold_timer()
                 elif self.current_fingers > self.required_fingers:
                     # Too many fingers, cancel hold
                     logging.debug(f"{self.name} - Too many fingers ({self.current_fingers} > {self.required_fingers}), cancelling hold")
                     self.stop_hold_timer()
+                    self.fail("too many fingers")
                     
             else:  # Finger up
                 self.current_fingers -= 1
@@ -135,8 +134,8 @@ class HoldGesture(Gesture):
                 
                 if self.current_fingers == 0:
                     # Calculate hold time only if we have a valid start_time from current session
-                    if hasattr(self, 'start_time') and self.start_time:
-                        hold_time = time.time() - self.start_time
+                    if self.start_time is not None:
+                        hold_time = self.now() - self.start_time
                         logging.debug(f"{self.name} - All fingers lifted after {hold_time:.2f}s")
                     else:
                         logging.debug(f"{self.name} - All fingers lifted (no timing available)")
@@ -153,12 +152,20 @@ class HoldGesture(Gesture):
                     logging.debug(f"{self.name} - Not enough fingers ({self.current_fingers} < {self.required_fingers}), cancelling hold")
                     self.stop_hold_timer()
 
+        # A new finger's first position arrives after its tracking ID; anchor it
+        # once the frame is complete
+        if event_type == 0 and event_code == 0:  # EV_SYN / SYN_REPORT
+            for finger_data in self.finger_positions.values():
+                if 'initial' not in finger_data and 'current' in finger_data:
+                    finger_data['initial'] = finger_data['current'].copy()
+
         # Check movement during hold period
         if self.hold_timer and len(self.finger_positions) >= self.required_fingers:
             movement_distance = self.calculate_max_movement_distance()
             if movement_distance > self.movement_tolerance:
                 logging.debug(f"{self.name} - Hold cancelled during movement: {movement_distance:.1f}px > {self.movement_tolerance}px")
                 self.stop_hold_timer()
+                self.fail("moved beyond tolerance")
                 return False
 
         return False
@@ -2,11 +2,20 @@ from .base import Gesture
 import math
 
 class PinchGesture(Gesture):
+    """Two-finger pinch, reported once per ``threshold`` pixels of distance change
+
+    Spreading triggers ``<action>:in`` and closing ``<action>:out``. The
+    baseline distance moves to the current one after every trigger, so a
+    long pinch produces one step per threshold crossed rather than one per
+    frame.
+    """
+
     def __init__(self, config):
         super().__init__(config)
         self.initial_distance = 0
         self.current_distance = 0
         self.threshold = config.get('threshold', 50)  # Minimum distance change to trigger pinch
+        self.current_slot = 0  # Current touch slot being updated
 
     def calculate_distance(self, point1: dict, point2: dict) -> float:
         """Calculate distance between two touch points"""
@@ -17,22 +26,38 @@ class PinchGesture(Gesture):
         return distance
 
     def process_event(self, event_type: int, event_code: int, event_value: int) -> bool:
-        # Update touch point coordinates
+        # Update touch point coordinates for the slot being reported
         if event_type == 3:  # EV_ABS
-            if event_code == 53:  # ABS_MT_POSITION_X
-                self.update_touch_point(0, event_value, self.get_touch_point(0)['y'], 0)
+            if event_code == 47:  # ABS_MT_SLOT
+                self.current_slot = event_value
+            elif event_code == 53:  # ABS_MT_POSITION_X
+                point = self.get_touch_point(self.current_slot)
+                self.update_touch_point(self.current_slot, event_value, point['y'], point['tracking_id'])
             elif event_code == 54:  # ABS_MT_POSITION_Y
-                self.update_touch_point(0, self.get_touch_point(0)['x'], event_value, 0)
+                point = self.get_touch_point(self.current_slot)
+                self.update_touch_point(self.current_slot, point['x'], event_value, point['tracking_id'])
             elif event_code == 57:  # ABS_MT_TRACKING_ID
                 self.log_event(event_type, event_code, event_value)
+                point = self.get_touch_point(self.current_slot)
                 if event_value >= 0:
+                    point['tracking_id'] = event_value
                     if not self.is_active:
                         self.initial_distance = 0
                         self.current_distance = 0
+                    if sum(1 for p in self.touch_points if p['tracking_id'] >= 0) > 2:
+                        self.fail("more than two fingers")
                 else:
-                    self.reset()
+                    # A finger lifted: the pinch (if any) is over, start a fresh baseline
+                    point['tracking_id'] = -1
+                    self.is_active = False
+                    self.initial_distance = 0
+                    self.current_distance = 0
                     return False
 
+        # Positions of a frame are only consistent once SYN_REPORT arrives
+        if event_type != 0 or event_code != 0:  # EV_SYN / SYN_REPORT
+            return False
+
         # Calculate distance between touch points
         active_points = [p for p in self.touch_points if p['tracking_id'] >= 0]
         if len(active_points) == 2:
@@ -40,12 +65,15 @@ class PinchGesture(Gesture):
             if self.initial_distance == 0:
                 self.initial_distance = self.current_distance
             else:
-                distance_change = abs(self.current_distance - self.initial_distance)
-                if distance_change > self.threshold:
-                    self.log_detection(distance_change=f"{distance_change:.2f}", threshold=self.threshold)
+                distance_change = self.current_distance - self.initial_distance
+                if abs(distance_change) > self.threshold:
+                    direction = 'in' if distance_change > 0 else 'out'
+                    self.log_detection(distance_change=f"{distance_change:.2f}", threshold=self.threshold,
+                                       direction=direction)
                     self.is_active = True
-                    # Trigger the gesture immediately via callback
-                    self.trigger_gesture()
+                    # The next step needs another full threshold of travel from here
+                    self.initial_distance = self.current_distance
+                    self.trigger_gesture(f"{self.action}:{direction}" if self.action else None)
                     return True
 
         return False
@@ -53,4 +81,5 @@ class PinchGesture(Gesture):
     def reset(self):
         super().reset()
         self.initial_distance = 0
-        self.current_distance = 0 
\ No newline at end of file
+        self.current_distance = 0
+        self.current_slot = 0 
\ No newline at end of file
@@ -0,0 +1,189 @@
+import math
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+EV_ABS = 3
+ABS_MT_POSITION_X = 53
+ABS_MT_POSITION_Y = 54
+ABS_MT_TRACKING_ID = 57
+
+Point = Tuple[float, float]
+
+
+class Region:
+    """A named screen area, in pixels, that gestures can be bound to
+
+    Configured under the top-level ``regions:`` section with either
+    ``rect: [x, y, width, height]`` or ``polygon: [[x, y], ...]``, and
+    optionally ``device`` (substring of the device name) to restrict it to
+    one panel.
+    """
+
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.device = config.get('device')
+        if 'rect' in config:
+            x, y, width, height = (float(v) for v in config['rect'])
+            self.polygon: Optional[List[Point]] = None
+            self.bounds = (x, y, x + width, y + height)
+        elif 'polygon' in config:
+            self.polygon = [(float(px), float(py)) for px, py in config['polygon']]
+            if len(self.polygon) < 3:
+                raise ValueError(f"Region {name}: a polygon needs at least 3 points")
+            xs = [p[0] for p in self.polygon]
+            ys = [p[1] for p in self.polygon]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            raise ValueError(f"Region {name}: needs 'rect' or 'polygon'")
+
+    def applies_to(self, device) -> bool:
+        # Replay has no device object, so device filters cannot apply
+        if not self.device or device is None:
+            return True
+        return self.device in getattr(device, 'name', '')
+
+    def contains(self, x: float, y: float) -> bool:
+        left, top, right, bottom = self.bounds
+        if not (left <= x < right and top <= y < bottom):
+            return False
+        if self.polygon is None:
+            return True
+        # Even-odd ray casting
+        inside = False
+        points = self.polygon
+        px, py = points[-1]
+        for qx, qy in points:
+            if (qy > y) != (py > y) and x < (px - qx) * (y - qy) / (py - qy) + qx:
+                inside = not inside
+            px, py = qx, qy
+        return inside
+
+    def covers(self, left: float, top: float, right: float, bottom: float) -> bool:
+        """True if the whole box lies inside the region"""
+        r_left, r_top, r_right, r_bottom = self.bounds
+        if not (r_left <= left and r_top <= top and right <= r_right and bottom <= r_bottom):
+            return False
+        if self.polygon is None:
+            return True
+        # No edge touches the box, so the box is entirely inside or entirely outside
+        points = self.polygon
+        for start, end in zip(points, points[1:] + points[:1]):
+            if _segment_hits_box(start, end, left, top, right, bottom):
+                return False
+        return self.contains(left, top)
+
+
+def _segment_hits_box(start: Point, end: Point, left: float, top: float, right: float, bottom: float) -> bool:
+    """Liang-Barsky clip: does the segment touch the closed box?"""
+    x0, y0 = start
+    dx, dy = end[0] - x0, end[1] - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - left), (dx, right - x0), (-dy, y0 - top), (dy, bottom - y0)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+
+class RegionIndex:
+    """Uniform grid mapping a point to the regions containing it
+
+    Every cell lists the regions covering it completely, which match
+    without a test, and those only overlapping it, which need an exact
+    containment test. A lookup therefore touches one cell and at most the
+    few regions crossing that cell, however many regions are configured.
+    """
+
+    def __init__(self, regions: Sequence[Region], cell_size: float = 32):
+        self.regions = list(regions)
+        self.cell_size = float(cell_size)
+        if not self.regions:
+            self.origin = (0.0, 0.0)
+            self.cols = self.rows = 0
+            self.cells: List[Tuple[Tuple[str, ...], Tuple[Region, ...]]] = []
+            return
+        left = min(r.bounds[0] for r in self.regions)
+        top = min(r.bounds[1] for r in self.regions)
+        right = max(r.bounds[2] for r in self.regions)
+        bottom = max(r.bounds[3] for r in self.regions)
+        self.origin = (left, top)
+        self.cols = max(1, math.ceil((right - left) / self.cell_size))
+        self.rows = max(1, math.ceil((bottom - top) / self.cell_size))
+        covered: List[List[str]] = [[] for _ in range(self.cols * self.rows)]
+        partial: List[List[Region]] = [[] for _ in range(self.cols * self.rows)]
+        for region in self.regions:
+            c0, r0, c1, r1 = self._cell_span(region.bounds)
+            for row in range(r0, r1 + 1):
+                for col in range(c0, c1 + 1):
+                    box = (left + col * self.cell_size, top + row * self.cell_size,
+                           left + (col + 1) * self.cell_size, top + (row + 1) * self.cell_size)
+                    index = row * self.cols + col
+                    if region.covers(*box):
+                        covered[index].append(region.name)
+                    else:
+                        partial[index].append(region)
+        self.cells = [(tuple(c), tuple(p)) for c, p in zip(covered, partial)]
+        logging.debug(f"Region index: {len(self.regions)} regions, {self.cols}x{self.rows} cells "
+                      f"of {self.cell_size:g}px")
+
+    def _cell_span(self, bounds) -> Tuple[int, int, int, int]:
+        left, top = self.origin
+        c0 = int((bounds[0] - left) // self.cell_size)
+        r0 = int((bounds[1] - top) // self.cell_size)
+        c1 = min(self.cols - 1, int(math.ceil((bounds[2] - left) / self.cell_size)) - 1)
+        r1 = min(self.rows - 1, int(math.ceil((bounds[3] - top) / self.cell_size)) - 1)
+        return c0, r0, c1, r1
+
+    def lookup(self, x: float, y: float) -> List[str]:
+        """Names of the regions containing the point"""
+        col = int((x - self.origin[0]) // self.cell_size)
+        row = int((y - self.origin[1]) // self.cell_size)
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return []
+        covered, partial = self.cells[row * self.cols + col]
+        if not partial:
+            return list(covered)
+        return list(covered) + [region.name for region in partial if region.contains(x, y)]
+
+
+def build_regions(config: Optional[Dict[str, Any]]) -> List[Region]:
+    """Parse the ``regions:`` section, skipping (and logging) invalid entries"""
+    regions = []
+    for name, region_config in (config or {}).items():
+        try:
+            regions.append(Region(name, region_config))
+        except (ValueError, TypeError) as e:
+            logging.error(f"Invalid region {name}: {e}")
+    return regions
+
+
+def touch_down_point(frame) -> Optional[Point]:
+    """Position of the first new contact in a conditioned frame
+
+    The conditioner emits a new contact as its tracking ID followed by its
+    X and Y, so the position is the next X/Y after the first tracking ID.
+    """
+    x = y = None
+    found = False
+    for event_type, event_code, event_value in frame:
+        if event_type != EV_ABS:
+            continue
+        if not found:
+            found = event_code == ABS_MT_TRACKING_ID and event_value >= 0
+        elif event_code == ABS_MT_POSITION_X:
+            x = event_value
+        elif event_code == ABS_MT_POSITION_Y:
+            y = event_value
+        else:
+            break
+    if x is None or y is None:
+        return None
+    return x, y
@@ -0,0 +1,40 @@
+import importlib
+import logging
+from typing import Dict, Optional, Tuple, Type
+
+# type name -> (module, class); modules are imported the first time a config enables the type
+GESTURE_TYPES: Dict[str, Tuple[str, str]] = {
+    'hold': ('gestures.hold', 'HoldGesture'),
+    'pinch': ('gestures.pinch', 'PinchGesture'),
+    'scroll': ('gestures.scroll', 'ScrollGesture'),
+    'tap': ('gestures.tap', 'TapGesture'),
+}
+
+_loaded: Dict[str, Type] = {}
+
+
+def gesture_class(gesture_type: str) -> Optional[Type]:
+    """Return the recognizer class for a gesture type, importing its module on first use
+
+    Args:
+        gesture_type (str): Gesture type name from the configuration
+
+    Returns:
+        Optional[Type]: The recognizer class, or None for an unknown type
+    """
+    cls = _loaded.get(gesture_type)
+    if cls is not None:
+        return cls
+    entry = GESTURE_TYPES.get(gesture_type)
+    if entry is None:
+        return None
+    module_name, class_name = entry
+    cls = getattr(importlib.import_module(module_name), class_name)
+    _loaded[gesture_type] = cls
+    logging.debug(f"Loaded gesture type {gesture_type} from {module_name}")
+    return cls
+
+
+def loaded_types() -> Tuple[str, ...]:
+    """Gesture types imported so far"""
+    return tuple(_loaded)
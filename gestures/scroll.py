@@ -0,0 +1,121 @@
+from .base import ContinuousGesture, STATE_BEGAN
+import math
+import logging
+
+class ScrollGesture(ContinuousGesture):
+    """Two-finger (configurable) scroll streaming centroid deltas
+
+    The fingers' centroid must travel ``threshold`` pixels while the distance
+    between them stays within ``spread_tolerance`` (otherwise it is a pinch).
+    From then on the centroid delta of every frame is reported, and lifting
+    a finger ends the scroll with the recent velocity for kinetic scrolling.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.required_fingers = config.get('fingers', 2)
+        self.threshold = config.get('threshold', 20)  # pixels of travel before scrolling starts
+        self.spread_tolerance = config.get('spread_tolerance', 30)  # pixels
+        # Release velocity only counts if the fingers were still moving this recently
+        self.release_window = config.get('release_window', 0.1)  # seconds
+        self.current_slot = 0
+        self.slots = {}  # slot -> [tracking_id, x, y]
+        self.anchor = None  # (x, y, spread) when the required fingers were down
+        self.last = None  # centroid reported last
+        self.last_time = 0.0
+        self.last_motion = 0.0
+        self.velocity = (0.0, 0.0)
+        self.ended = False
+
+    def _centroid(self, points):
+        count = len(points)
+        cx = sum(p[1] for p in points) / count
+        cy = sum(p[2] for p in points) / count
+        spread = sum(math.hypot(p[1] - cx, p[2] - cy) for p in points) / count
+        return cx, cy, spread
+
+    def process_event(self, event_type: int, event_code: int, event_value: int) -> bool:
+        if event_type == 3:  # EV_ABS
+            if event_code == 47:  # ABS_MT_SLOT
+                self.current_slot = event_value
+            elif event_code == 53:  # ABS_MT_POSITION_X
+                self.slots.setdefault(self.current_slot, [-1, 0, 0])[1] = event_value
+            elif event_code == 54:  # ABS_MT_POSITION_Y
+                self.slots.setdefault(self.current_slot, [-1, 0, 0])[2] = event_value
+            elif event_code == 57:  # ABS_MT_TRACKING_ID
+                self.log_event(event_type, event_code, event_value)
+                if event_value >= 0:
+                    self.slots.setdefault(self.current_slot, [-1, 0, 0])[0] = event_value
+                else:
+                    self.slots.pop(self.current_slot, None)
+                self._fingers_changed(lifted=event_value < 0)
+            return False
+
+        # Positions of a frame are only consistent once SYN_REPORT arrives
+        if event_type != 0 or event_code != 0 or self.ended:  # EV_SYN / SYN_REPORT
+            return False
+        points = [p for p in self.slots.values() if p[0] >= 0]
+        if len(points) != self.required_fingers:
+            return False
+
+        cx, cy, spread = self._centroid(points)
+        now = self.now()
+        if self.anchor is None:
+            self.anchor = (cx, cy, spread)
+            self.last = (cx, cy)
+            self.last_time = now
+            return False
+
+        if self.state != STATE_BEGAN:
+            if abs(spread - self.anchor[2]) > self.spread_tolerance:
+                self.fail("distance between fingers changed")
+                return False
+            travel = math.hypot(cx - self.anchor[0], cy - self.anchor[1])
+            if travel <= self.threshold:
+                return False
+            self.log_detection(travel=f"{travel:.1f}px", fingers=len(points))
+            self.is_active = True
+            self.trigger_gesture()
+            if self.state != STATE_BEGAN:
+                # Lost arbitration inside the callback and was reset
+                return False
+
+        dx = cx - self.last[0]
+        dy = cy - self.last[1]
+        if dx or dy:
+            dt = now - self.last_time
+            if dt > 0:
+                # Smooth the per-frame velocity so one jittery frame does not decide the fling
+                vx, vy = self.velocity
+                self.velocity = (vx + 0.5 * (dx / dt - vx), vy + 0.5 * (dy / dt - vy))
+            self.last_motion = now
+            self.update_gesture(dx, dy)
+        self.last = (cx, cy)
+        self.last_time = now
+        return self.is_active
+
+    def _fingers_changed(self, lifted: bool):
+        if self.state == STATE_BEGAN:
+            if not self.ended:
+                self.ended = True
+                self.is_active = False
+                # Only a lift flings; adding a finger stops the scroll dead
+                recent = lifted and self.now() - self.last_motion <= self.release_window
+                vx, vy = self.velocity if recent else (0.0, 0.0)
+                logging.debug(f"{self.name} - Scroll ended, release velocity ({vx:.0f}, {vy:.0f}) px/s")
+                self.end_gesture(vx, vy)
+            return
+        active = sum(1 for p in self.slots.values() if p[0] >= 0)
+        if active > self.required_fingers:
+            self.fail("too many fingers")
+        # Fingers rarely land in the same frame: measure travel from the latest finger change
+        self.anchor = None
+
+    def reset(self):
+        super().reset()
+        self.current_slot = 0
+        self.slots = {}
+        self.anchor = None
+        self.last = None
+        self.velocity = (0.0, 0.0)
+        self.ended = False
@@ -0,0 +1,138 @@
+from .base import Gesture, STATE_POSSIBLE
+from collections import deque
+import logging
+import math
+
+class TapGesture(Gesture):
+    """Single and multi-finger taps, counted into double, triple, ... taps
+
+    A touch is a tap when it lifts within ``max_duration`` and no finger
+    moves more than ``movement_tolerance``. Its finger count is the most
+    fingers down at once. Successive taps with the same finger count, each
+    lifting within ``interval`` of the previous one and within ``slop``
+    pixels of it, form one chain. A chain resolves to the binding for its
+    (fingers, taps) when its deadline passes, or immediately when no
+    binding with more taps exists for that finger count.
+
+    One scheduler deadline is re-armed per tap, and the chain is kept in a
+    history bounded by the largest bound tap count, so each touch costs the
+    same however many taps or bindings there are.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        # Taps must never block or cancel hold/pinch/scroll, so they compete only among themselves
+        self.group = config.get('group', 'tap')
+        self.max_duration = config.get('max_duration', 0.2)  # seconds
+        self.movement_tolerance = config.get('movement_tolerance', 15)  # pixels
+        self.interval = config.get('interval', 0.3)  # seconds between tap lifts
+        self.slop = config.get('slop', 40)  # pixels between taps of a chain
+        self.bindings = {}  # (fingers, taps) -> action
+        self.max_taps = {}  # fingers -> highest bound tap count
+        for binding in config.get('bindings', []):
+            fingers = int(binding.get('fingers', 1))
+            taps = int(binding.get('taps', 1))
+            self.bindings[(fingers, taps)] = binding['action']
+            self.max_taps[fingers] = max(self.max_taps.get(fingers, 0), taps)
+        self.history = deque(maxlen=max(self.max_taps.values(), default=1))  # (time, x, y, fingers)
+        self.deadline = None
+        self.current_slot = 0
+        self.positions = {}  # slot -> [initial_x, initial_y, x, y]; initial is None until SYN_REPORT
+        self.fingers = 0
+        self.max_fingers = 0
+        self.valid = False
+        logging.debug(f"{self.name} - Bindings: {self.bindings}")
+
+    def process_event(self, event_type: int, event_code: int, event_value: int) -> bool:
+        if event_type == 3:  # EV_ABS
+            if event_code == 47:  # ABS_MT_SLOT
+                self.current_slot = event_value
+            elif event_code == 53:  # ABS_MT_POSITION_X
+                self.positions.setdefault(self.current_slot, [None, None, 0, 0])[2] = event_value
+            elif event_code == 54:  # ABS_MT_POSITION_Y
+                self.positions.setdefault(self.current_slot, [None, None, 0, 0])[3] = event_value
+            elif event_code == 57:  # ABS_MT_TRACKING_ID
+                self.log_event(event_type, event_code, event_value)
+                if event_value >= 0:
+                    if self.fingers == 0:
+                        # First finger of a touch
+                        self.start_time = self.now()
+                        self.valid = True
+                        self.max_fingers = 0
+                    self.fingers += 1
+                    self.max_fingers = max(self.max_fingers, self.fingers)
+                else:
+                    self.fingers = max(0, self.fingers - 1)
+                    if self.fingers == 0:
+                        return self._touch_ended()
+            return False
+
+        if event_type == 0 and event_code == 0 and self.valid:  # EV_SYN / SYN_REPORT
+            for position in self.positions.values():
+                if position[0] is None:
+                    position[0], position[1] = position[2], position[3]
+                elif math.hypot(position[2] - position[0], position[3] - position[1]) > self.movement_tolerance:
+                    self.valid = False
+                    logging.debug(f"{self.name} - Not a tap: moved beyond {self.movement_tolerance}px")
+                    break
+        return False
+
+    def _touch_ended(self) -> bool:
+        now = self.now()
+        points = [p for p in self.positions.values() if p[0] is not None]
+        self.positions = {}
+        if not self.valid or not points or now - self.start_time > self.max_duration:
+            # Not a tap; it also ends any chain in progress
+            self._resolve()
+            return False
+        x = sum(p[0] for p in points) / len(points)
+        y = sum(p[1] for p in points) / len(points)
+        if self.history:
+            last_time, last_x, last_y, last_fingers = self.history[-1]
+            if (last_fingers != self.max_fingers or now - last_time > self.interval or
+                    math.hypot(x - last_x, y - last_y) > self.slop):
+                self._resolve()
+        self.history.append((now, x, y, self.max_fingers))
+        self._cancel_deadline()
+        if len(self.history) >= self.max_taps.get(self.max_fingers, 0):
+            # No binding with more taps: nothing to wait for
+            return self._resolve()
+        self.deadline = self.scheduler.call_at(now + self.interval, self._deadline_passed)
+        return False
+
+    def _deadline_passed(self):
+        self.deadline = None
+        self._resolve()
+
+    def _cancel_deadline(self):
+        if self.deadline is not None:
+            self.deadline.cancel()
+            self.deadline = None
+
+    def _resolve(self) -> bool:
+        """Fire the binding matching the chain so far and start a new chain"""
+        self._cancel_deadline()
+        if not self.history:
+            return False
+        taps = len(self.history)
+        fingers = self.history[-1][3]
+        self.history.clear()
+        action = self.bindings.get((fingers, taps))
+        if action is None:
+            logging.debug(f"{self.name} - No binding for {fingers}-finger x{taps} tap")
+            return False
+        self.log_detection(fingers=fingers, taps=taps, action=action)
+        self.trigger_gesture(action)
+        # A tap is over once reported; stay armed for the next one
+        self.state = STATE_POSSIBLE
+        return True
+
+    def reset(self):
+        super().reset()
+        self._cancel_deadline()
+        self.history.clear()
+        self.current_slot = 0
+        self.positions = {}
+        self.fingers = 0
+        self.max_fingers = 0
+        self.valid = False
@@ -0,0 +1,153 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ABS_MT_POSITION_X = 53
+ABS_MT_POSITION_Y = 54
+
+# Largest axis range turned into a lookup table; wider axes use the affine form
+MAX_LUT_SIZE = 65536
+
+# Rotations as affine maps on normalized [0, 1] coordinates (clockwise)
+ROTATIONS = {
+    0: (1, 0, 0, 0, 1, 0),
+    90: (0, -1, 1, 1, 0, 0),
+    180: (-1, 0, 1, 0, -1, 1),
+    270: (0, 1, 0, -1, 0, 1),
+}
+
+Affine = Tuple[float, float, float, float, float, float]
+
+
+def _compose(outer: Sequence[float], inner: Sequence[float]) -> Affine:
+    """Return the affine map outer(inner(p))"""
+    a, b, c, d, e, f = outer
+    g, h, i, j, k, l = inner
+    return (a * g + b * j, a * h + b * k, a * i + b * l + c,
+            d * g + e * j, d * h + e * k, d * i + e * l + f)
+
+
+class CoordinateTransform:
+    """Map raw device coordinates to screen pixels
+
+    The device range, rotation, optional calibration matrix and screen size
+    are composed once into a single affine map from raw units to pixels.
+    When each output depends on a single input axis (any rotation without a
+    shearing matrix), the map is further flattened into two integer lookup
+    tables, so applying it costs two list indexings per point.
+    """
+
+    def __init__(self, x_range: Tuple[int, int], y_range: Tuple[int, int],
+                 width: Optional[int], height: Optional[int],
+                 rotation: int = 0, matrix: Optional[Sequence[float]] = None):
+        self.x_min, self.x_max = x_range
+        self.y_min, self.y_max = y_range
+        if rotation not in ROTATIONS:
+            raise ValueError(f"Unsupported rotation {rotation}, expected one of {sorted(ROTATIONS)}")
+        x_span = max(1, self.x_max - self.x_min)
+        y_span = max(1, self.y_max - self.y_min)
+        # Without a screen size, keep the device's own scale
+        self.width = width if width else x_span
+        self.height = height if height else y_span
+
+        normalize = (1.0 / x_span, 0, -self.x_min / x_span, 0, 1.0 / y_span, -self.y_min / y_span)
+        affine = _compose(ROTATIONS[rotation], normalize)
+        if matrix is not None:
+            if len(matrix) != 6:
+                raise ValueError("Calibration matrix needs 6 values: a b c d e f")
+            affine = _compose(matrix, affine)
+        self.affine = _compose((self.width, 0, 0, 0, self.height, 0), affine)
+        self.apply = self._build()
+
+    def _build(self) -> Callable[[int, int], Tuple[int, int]]:
+        a, b, c, d, e, f = self.affine
+        x_size = self.x_max - self.x_min + 1
+        y_size = self.y_max - self.y_min + 1
+        if max(x_size, y_size) <= MAX_LUT_SIZE:
+            if b == 0 and d == 0:
+                self.mode = 'lut'
+                return self._lut_apply(self._lut(a, c, self.x_min, x_size),
+                                       self._lut(e, f, self.y_min, y_size), swap=False)
+            if a == 0 and e == 0:
+                self.mode = 'lut-swapped'
+                return self._lut_apply(self._lut(d, f, self.x_min, x_size),
+                                       self._lut(b, c, self.y_min, y_size), swap=True)
+        self.mode = 'affine'
+
+        def affine_apply(x: int, y: int) -> Tuple[int, int]:
+            return int(round(a * x + b * y + c)), int(round(d * x + e * y + f))
+        return affine_apply
+
+    @staticmethod
+    def _lut(scale: float, offset: float, start: int, size: int) -> List[int]:
+        return [int(round(scale * (start + i) + offset)) for i in range(size)]
+
+    def _lut_apply(self, lut_first: List[int], lut_second: List[int], swap: bool):
+        x_min, y_min = self.x_min, self.y_min
+        x_last, y_last = len(lut_first) - 1, len(lut_second) - 1
+
+        def lut_apply(x: int, y: int) -> Tuple[int, int]:
+            i = x - x_min
+            j = y - y_min
+            # Clamp: panels may report slightly outside their advertised range
+            i = 0 if i < 0 else x_last if i > x_last else i
+            j = 0 if j < 0 else y_last if j > y_last else j
+            if swap:
+                return lut_second[j], lut_first[i]
+            return lut_first[i], lut_second[j]
+        return lut_apply
+
+    def describe(self) -> str:
+        return (f"x {self.x_min}..{self.x_max}, y {self.y_min}..{self.y_max} -> "
+                f"{self.width}x{self.height}px ({self.mode})")
+
+
+def screen_size() -> Optional[Tuple[int, int]]:
+    """Size of the X screen in pixels, or None when X is unavailable"""
+    try:
+        from Xlib import display
+        screen = display.Display().screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+    except Exception as e:
+        logging.debug(f"Could not query X screen size: {e}")
+        return None
+
+
+def _axis_range(device, code: int, configured: Optional[Sequence[int]]) -> Optional[Tuple[int, int]]:
+    if configured:
+        return int(configured[0]), int(configured[1])
+    if device is None:
+        return None
+    try:
+        info = device.absinfo(code)
+        return info.min, info.max
+    except Exception as e:
+        logging.debug(f"No absinfo for axis {code}: {e}")
+        return None
+
+
+def build_transform(device, config: Optional[Dict[str, Any]]) -> Optional[CoordinateTransform]:
+    """Build the raw-to-pixel transform for a device from its config entry
+
+    Args:
+        device: evdev.InputDevice, or None when replaying a capture
+        config (dict, optional): The device's ``calibration:`` section
+
+    Returns:
+        Optional[CoordinateTransform]: None when the device range is unknown
+    """
+    config = config or {}
+    if config.get('enabled', True) is False:
+        return None
+    x_range = _axis_range(device, ABS_MT_POSITION_X, config.get('x_range'))
+    y_range = _axis_range(device, ABS_MT_POSITION_Y, config.get('y_range'))
+    if x_range is None or y_range is None:
+        return None
+    width, height = config.get('width'), config.get('height')
+    if not (width and height):
+        size = screen_size()
+        if size:
+            width, height = size
+    transform = CoordinateTransform(x_range, y_range, width, height,
+                                    int(config.get('rotation', 0)), config.get('matrix'))
+    logging.info(f"Calibration for {getattr(device, 'name', 'replay')}: {transform.describe()}")
+    return transform
@@ -0,0 +1,247 @@
+import math
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from input.resync import MTSnapshot
+
+EV_SYN = 0
+EV_ABS = 3
+SYN_REPORT = 0
+SYN_DROPPED = 3
+ABS_MT_SLOT = 47
+ABS_MT_POSITION_X = 53
+ABS_MT_POSITION_Y = 54
+ABS_MT_TRACKING_ID = 57
+
+Event = Tuple[int, int, int]
+
+
+class OneEuroFilter:
+    """One-Euro low-pass filter (Casiez et al.) for a single coordinate"""
+
+    __slots__ = ('min_cutoff', 'beta', 'd_cutoff', 'value', 'derivative', 'timestamp')
+
+    def __init__(self, min_cutoff: float, beta: float, d_cutoff: float):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value: Optional[float] = None
+        self.derivative = 0.0
+        self.timestamp = 0.0
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value: float, timestamp: float) -> float:
+        if self.value is None:
+            self.value = value
+            self.timestamp = timestamp
+            return value
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+        self.timestamp = timestamp
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.derivative += a_d * ((value - self.value) / dt - self.derivative)
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        self.value += self._alpha(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class _Slot:
+    __slots__ = ('tracking_id', 'x', 'y', 'out_id', 'out_x', 'out_y', 'filter_x', 'filter_y')
+
+    def __init__(self):
+        self.tracking_id = -1
+        self.x = 0
+        self.y = 0
+        # Last state handed to the recognizers
+        self.out_id = -1
+        self.out_x = 0
+        self.out_y = 0
+        self.filter_x: Optional[OneEuroFilter] = None
+        self.filter_y: Optional[OneEuroFilter] = None
+
+
+class InputConditioner:
+    """Decode MT slots for one device and emit only meaningful frame changes
+
+    Raw events update a per-slot state; nothing is forwarded until
+    SYN_REPORT. The completed frame is compared with what the recognizers
+    last saw: touches and lifts always pass, while position updates are
+    mapped to screen pixels by the device's calibration transform,
+    optionally smoothed (One-Euro) and dropped when they stay within
+    ``deadband`` pixels of the last emitted position. Frames without any
+    remaining change are dropped entirely (``dedup``). The output is a normal
+    slot/tracking-ID/position/SYN_REPORT stream, so recognizers are
+    unchanged. Events unrelated to MT slots are not forwarded.
+
+    After SYN_DROPPED (the kernel buffer overflowed) every event up to the
+    next SYN_REPORT is discarded and the slot state is rebuilt at once
+    from ``resync`` (normally query_mt_slots on the device). The frame
+    released then starts with SYN_DROPPED, telling downstream to reset,
+    followed by every live contact as a fresh touch. Without a resync
+    source all contacts are taken as lifted.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, transform=None,
+                 resync: Optional[Callable[[], MTSnapshot]] = None):
+        config = config or {}
+        self.transform = transform
+        self.resync = resync
+        self.dropping = False
+        self.deadband = float(config.get('deadband', 0))
+        self.dedup = config.get('dedup', True)
+        smoothing = config.get('smoothing') or {}
+        self.smoothing = smoothing.get('enabled', False)
+        self.min_cutoff = float(smoothing.get('min_cutoff', 1.0))
+        self.beta = float(smoothing.get('beta', 0.007))
+        self.d_cutoff = float(smoothing.get('d_cutoff', 1.0))
+        self.slots: List[_Slot] = []
+        self.current_slot = 0
+        self.events_in = 0
+        self.frames_in = 0
+        self.frames_out = 0
+        self.events_out = 0
+        self.overruns = 0
+        self.discarded = 0
+
+    def _slot(self, index: int) -> _Slot:
+        while len(self.slots) <= index:
+            self.slots.append(_Slot())
+        return self.slots[index]
+
+    def feed(self, event) -> List[Event]:
+        """Consume one raw event; return the conditioned events it releases"""
+        self.events_in += 1
+        event_type = event.type
+        if self.dropping:
+            if event_type == EV_SYN and event.code == SYN_REPORT:
+                self.dropping = False
+                return self._resync(event.timestamp())
+            self.discarded += 1
+            return []
+        if event_type == EV_ABS:
+            code = event.code
+            if code == ABS_MT_SLOT:
+                self.current_slot = event.value
+            elif code == ABS_MT_POSITION_X:
+                self._slot(self.current_slot).x = event.value
+            elif code == ABS_MT_POSITION_Y:
+                self._slot(self.current_slot).y = event.value
+            elif code == ABS_MT_TRACKING_ID:
+                self._slot(self.current_slot).tracking_id = event.value
+            return []
+        if event_type == EV_SYN:
+            if event.code == SYN_REPORT:
+                return self._end_frame(event.timestamp())
+            if event.code == SYN_DROPPED:
+                self.dropping = True
+                self.overruns += 1
+                logging.warning(f"Input overrun (SYN_DROPPED #{self.overruns}), resyncing slot state")
+        return []
+
+    def _resync(self, timestamp: float) -> List[Event]:
+        snapshot = None
+        if self.resync is not None:
+            try:
+                snapshot = self.resync()
+            except OSError as e:
+                logging.error(f"Slot state query failed, dropping all contacts: {e}")
+        if snapshot is None:
+            current, values = self.current_slot, []
+        else:
+            current, values = snapshot
+        self.current_slot = current
+        if values:
+            self._slot(len(values) - 1)
+        for index, slot in enumerate(self.slots):
+            if index < len(values):
+                slot.tracking_id, slot.x, slot.y = values[index]
+            else:
+                slot.tracking_id = -1
+            # Downstream resets on SYN_DROPPED, so live contacts are re-emitted as new touches
+            slot.out_id = -1
+            slot.filter_x = slot.filter_y = None
+        frame = self._end_frame(timestamp)
+        if not frame:
+            frame = [(EV_SYN, SYN_REPORT, 0)]
+            self.frames_out += 1
+            self.events_out += 1
+        frame.insert(0, (EV_SYN, SYN_DROPPED, 0))
+        self.events_out += 1
+        return frame
+
+    def _filtered(self, slot: _Slot, timestamp: float) -> Tuple[float, float]:
+        if self.transform is not None:
+            x, y = self.transform.apply(slot.x, slot.y)
+        else:
+            x, y = slot.x, slot.y
+        if not self.smoothing:
+            return x, y
+        if slot.filter_x is None:
+            slot.filter_x = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff)
+            slot.filter_y = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff)
+        return slot.filter_x(x, timestamp), slot.filter_y(y, timestamp)
+
+    def _end_frame(self, timestamp: float) -> List[Event]:
+        self.frames_in += 1
+        out: List[Event] = []
+        for index, slot in enumerate(self.slots):
+            if slot.tracking_id != slot.out_id:
+                if slot.out_id >= 0:
+                    # Lift (or the slot was reused by a new contact without a visible lift)
+                    out.append((EV_ABS, ABS_MT_SLOT, index))
+                    out.append((EV_ABS, ABS_MT_TRACKING_ID, -1))
+                    slot.filter_x = slot.filter_y = None
+                slot.out_id = slot.tracking_id
+                if slot.tracking_id >= 0:
+                    x, y = self._filtered(slot, timestamp)
+                    slot.out_x, slot.out_y = int(round(x)), int(round(y))
+                    out.append((EV_ABS, ABS_MT_SLOT, index))
+                    out.append((EV_ABS, ABS_MT_TRACKING_ID, slot.tracking_id))
+                    out.append((EV_ABS, ABS_MT_POSITION_X, slot.out_x))
+                    out.append((EV_ABS, ABS_MT_POSITION_Y, slot.out_y))
+                continue
+            if slot.tracking_id < 0:
+                continue
+            x, y = self._filtered(slot, timestamp)
+            x, y = int(round(x)), int(round(y))
+            dx = x - slot.out_x
+            dy = y - slot.out_y
+            if dx == 0 and dy == 0:
+                continue
+            if self.deadband > 0 and dx * dx + dy * dy < self.deadband * self.deadband:
+                continue
+            out.append((EV_ABS, ABS_MT_SLOT, index))
+            if dx:
+                out.append((EV_ABS, ABS_MT_POSITION_X, x))
+                slot.out_x = x
+            if dy:
+                out.append((EV_ABS, ABS_MT_POSITION_Y, y))
+                slot.out_y = y
+        if not out and self.dedup:
+            return out
+        out.append((EV_SYN, SYN_REPORT, 0))
+        self.frames_out += 1
+        self.events_out += len(out)
+        return out
+
+    def active_contacts(self) -> int:
+        """Number of contacts the recognizers currently see as down"""
+        return sum(1 for slot in self.slots if slot.out_id >= 0)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'events_in': self.events_in,
+            'frames_in': self.frames_in,
+            'frames_out': self.frames_out,
+            'events_out': self.events_out,
+            'overruns': self.overruns,
+            'discarded': self.discarded,
+        }
+
+    def log_stats(self, label: str = ''):
+        stats = ", ".join(f"{k}={v}" for k, v in self.stats().items())
+        logging.info(f"Conditioning{' ' + label if label else ''}: {stats}")
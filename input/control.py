@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import socket
+import logging
+from typing import Any, Callable, Dict, List
+
+DEFAULT_SOCKET = '/tmp/touchgesture.sock'
+MAX_REQUEST = 4096
+REPLY_TIMEOUT = 1.0  # seconds a client may leave its reply unread before it is dropped
+
+
+class ControlServer:
+    """Local Unix-socket control API served from the listener's event loop
+
+    Each connection carries one JSON request line (``{"cmd": ..., ...}``)
+    and receives one JSON reply line before being closed. The listening
+    socket and pending connections are non-blocking and polled by the same
+    select() as the input devices, so the event loop never waits on a
+    client. A reply that does not fit in the socket buffer is queued and
+    flushed when select() reports the connection writable; a client that
+    stops reading for REPLY_TIMEOUT is dropped.
+    """
+
+    def __init__(self, path: str, handler: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.path = path
+        self.handler = handler
+        self.connections: Dict[socket.socket, bytes] = {}
+        self.replies: Dict[socket.socket, List[Any]] = {}  # conn -> [unsent bytes, deadline]
+        if os.path.exists(path):
+            os.unlink(path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.bind(path)
+        os.chmod(path, 0o600)
+        self.sock.listen(4)
+        self.sock.setblocking(False)
+        logging.info(f"Control socket listening on {path}")
+
+    def fileobjects(self) -> List[socket.socket]:
+        """Sockets to include in the event loop's select()"""
+        return [self.sock] + list(self.connections)
+
+    def writers(self) -> List[socket.socket]:
+        """Connections with a queued reply, for the event loop's select() write set"""
+        if self.replies:
+            now = time.monotonic()
+            for conn, (_, deadline) in list(self.replies.items()):
+                if now >= deadline:
+                    logging.debug("Control client is not reading its reply, dropping it")
+                    self._drop(conn)
+        return list(self.replies)
+
+    def owns(self, fileobj) -> bool:
+        return fileobj is self.sock or fileobj in self.connections or fileobj in self.replies
+
+    def handle_readable(self, fileobj):
+        if fileobj is self.sock:
+            try:
+                conn, _ = self.sock.accept()
+            except BlockingIOError:
+                return
+            conn.setblocking(False)
+            self.connections[conn] = b''
+            return
+
+        try:
+            data = fileobj.recv(MAX_REQUEST)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        buffer = self.connections[fileobj] + data
+        if data and b'\n' not in buffer and len(buffer) < MAX_REQUEST:
+            self.connections[fileobj] = buffer
+            return
+        del self.connections[fileobj]
+        if buffer.strip():
+            self._reply(fileobj, buffer.split(b'\n', 1)[0])
+        else:
+            fileobj.close()
+
+    def handle_writable(self, fileobj):
+        if fileobj in self.replies:
+            self._flush(fileobj)
+
+    def _reply(self, conn: socket.socket, line: bytes):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            response = self.handler(request)
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        self.replies[conn] = [json.dumps(response, default=str).encode() + b'\n',
+                              time.monotonic() + REPLY_TIMEOUT]
+        self._flush(conn)
+
+    def _flush(self, conn: socket.socket):
+        """Send as much of a queued reply as the socket takes without blocking"""
+        reply = self.replies[conn]
+        try:
+            sent = conn.send(reply[0])
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logging.debug(f"Control client went away: {e}")
+            self._drop(conn)
+            return
+        reply[0] = reply[0][sent:]
+        if not reply[0]:
+            self._drop(conn)
+
+    def _drop(self, conn: socket.socket):
+        del self.replies[conn]
+        conn.close()
+
+    def close(self):
+        for conn in list(self.connections) + list(self.replies):
+            conn.close()
+        self.connections.clear()
+        self.replies.clear()
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def send_request(path: str, request: Dict[str, Any], timeout: float = 5.0) -> Dict[str, Any]:
+    """Send one request to a running daemon and return its reply
+
+    Args:
+        path (str): Control socket path
+        request (dict): Request object, e.g. {"cmd": "status"}
+        timeout (float): Seconds to wait for the reply
+
+    Returns:
+        dict: Decoded JSON reply
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b''.join(chunks))
@@ -1,70 +1,174 @@
-import evdev
-from typing import List, Dict, Any, Optional
-import yaml
+from typing import List, Dict, Any, Optional, Set, Tuple
 import os
+import time
+import signal
 import logging
-from gestures.hold import HoldGesture
-from gestures.pinch import PinchGesture
-from utils.logging_utils import setup_logging
-from utils.device_utils import find_device_by_name, find_device_by_id
-import threading
+from gestures.base import PHASE_END
+from gestures.registry import gesture_class
+from gestures.arbiter import GestureArbiter
+from gestures.regions import RegionIndex, build_regions, touch_down_point
+from input.conditioning import InputConditioner, EV_SYN, SYN_REPORT, SYN_DROPPED
+from input.resync import query_mt_slots
+from input.calibration import build_transform
+from utils.logging_utils import logging_stats
+from utils.config import load_config
+from utils.clock import Scheduler, MonotonicClock, VirtualClock
+from utils.capture import read_capture, CaptureWriter
+from actions.throttle import ActionThrottle
+from actions.command_runner import CommandRunner
+from actions.bus import GestureBus, DEFAULT_BUS_SOCKET, socket_mode, KIND_GESTURE, KIND_UPDATE, KIND_END
+from utils.profiling import StageProfiler, StartupTimer
+from utils.trace import TraceRing, TRACE_GESTURES, TRACE_EVENTS
+from utils.latency import LatencyTuner
+from input.control import ControlServer, DEFAULT_SOCKET, REPLY_TIMEOUT
 
 class InputListener:
-    def __init__(self, config_path: str, verbose: bool = False):
+    def __init__(self, config_path: str, verbose: bool = False, replay: bool = False,
+                 profile: bool = False, config: Optional[Dict[str, Any]] = None,
+                 startup: Optional[StartupTimer] = None):
         self.verbose = verbose
-        self.config = self._load_config(config_path)
-        self.devices: List[evdev.InputDevice] = []
+        self.startup = startup
+        self.replay_mode = replay
+        # Replay is record-only: actions land here instead of reaching xdotool or commands
+        self.detections: List[Tuple[str, float, int]] = []  # (action, virtual time, count)
+        self.profiler = StageProfiler(enabled=profile)
+        # Callers that already parsed the file (main, for logging setup) pass it in
+        self.config = config if config is not None else load_config(config_path)
+        self.devices: List[Any] = []  # evdev.InputDevice
+        self.device_configs: Dict[str, Dict[str, Any]] = {}  # device path -> devices[] entry
         self.gestures = []
+        self.arbiter = GestureArbiter()
+        self.arbiter.set_callback(self._on_gesture_detected)
+        self.arbiter.set_update_callback(self._on_gesture_update)
         self.total_active_fingers = 0
+        self.regions = build_regions(self.config.get('regions'))
+        self.region_indexes: Dict[Optional[str], RegionIndex] = {}  # device path (None in replay)
+        self.conditioning_config = self.config.get('conditioning') or {}
+        self.conditioning_enabled = self.conditioning_config.get('enabled', True)
+        # evdev.InputDevice is unhashable (__eq__ without __hash__): per-device state is keyed by path
+        self.conditioners: Dict[Optional[str], InputConditioner] = {}  # device path (None in replay)
+        # Unconditioned devices discarding events after SYN_DROPPED, until their next SYN_REPORT
+        self.raw_dropping: Set[Optional[str]] = set()
         self.device_grabbed = False
         self.grab_timeout_timer = None
-        self._setup_logging()
+        self.safety_ungrab_timer = None
+        self.action_throttles: Dict[str, ActionThrottle] = {}
+        # Replay runs on recorded event time so results do not depend on host speed
+        self.scheduler = Scheduler(VirtualClock() if replay else MonotonicClock())
+        self.command_runner = CommandRunner(self.scheduler)
+        self.scroll_outputs: Dict[str, Any] = {}  # ScrollOutput
+        self.pointer = None  # XTestPointer, opened when a scroll action is configured
+        self.control_config = self.config.get('control') or {}
+        self.control: Optional[ControlServer] = None
+        self.bus_config = self.config.get('bus') or {}
+        self.bus: Optional[GestureBus] = None
+        self.trace = TraceRing(self.control_config.get('trace_size', 4096),
+                               self.control_config.get('trace_level', 0))
+        self.capture_writer: Optional[CaptureWriter] = None
+        self.capture_timer = None
+        self.latency: Optional[LatencyTuner] = None
         self._setup_gestures()
-        self._setup_devices()
+        self._startup_mark('gestures')
+        self._setup_actions()
+        self._startup_mark('actions')
+        if not replay:
+            self._setup_devices()
+            self._startup_mark('devices')
 
-    def _load_config(self, config_path: str) -> Dict[str, Any]:
-        """Load configuration from YAML file"""
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            if self.verbose:
-                logging.debug(f"Loaded configuration: {config}")
-            return config
-
-    def _setup_logging(self):
-        """Setup logging configuration"""
-        log_config = self.config.get('debug', {})
-        log_file = log_config.get('log_file', '/var/log/touchgesture.log')
-        setup_logging(self.verbose, log_file)
+    def _startup_mark(self, stage: str):
+        if self.startup is not None:
+            self.startup.mark(stage)
 
     def _setup_gestures(self):
-        """Initialize gesture recognizers based on config"""
+        """Initialize gesture recognizers based on config
+
+        Each entry's ``type`` defaults to its key, so several bindings of
+        the same gesture (e.g. per screen region) can coexist. Only the
+        modules of enabled types are imported.
+        """
         gesture_configs = self.config.get('gestures', {})
-        
-        if gesture_configs.get('hold', {}).get('enabled', False):
-            hold_gesture = HoldGesture(gesture_configs['hold'])
-            hold_gesture.set_gesture_callback(self._on_gesture_detected)
-            self.gestures.append(hold_gesture)
-            logging.debug("Hold gesture enabled")
-        
-        if gesture_configs.get('pinch', {}).get('enabled', False):
-            pinch_gesture = PinchGesture(gesture_configs['pinch'])
-            pinch_gesture.set_gesture_callback(self._on_gesture_detected)
-            self.gestures.append(pinch_gesture)
-            logging.debug("Pinch gesture enabled")
+        region_names = {region.name for region in self.regions}
+
+        for key, gesture_config in gesture_configs.items():
+            if not gesture_config or not gesture_config.get('enabled', False):
+                continue
+            gesture_type = gesture_config.get('type', key)
+            cls = gesture_class(gesture_type)
+            if cls is None:
+                logging.error(f"Unknown gesture type for {key}: {gesture_type}")
+                continue
+            gesture = cls(gesture_config)
+            if key != gesture_type:
+                gesture.name = f"{gesture.name}[{key}]"
+            unknown = gesture.regions - region_names
+            if unknown:
+                logging.error(f"Gesture {key} refers to undefined region(s): {', '.join(sorted(unknown))}")
+            if gesture.regions and not self.conditioning_enabled:
+                # Regions are armed from conditioned, calibrated frames; unarmed it would fire anywhere
+                logging.warning(f"Gesture {key} is bound to regions, which need conditioning enabled; "
+                                f"it is disabled")
+                continue
+            gesture.set_scheduler(self.scheduler)
+            self.arbiter.add(gesture)
+            self.gestures.append(gesture)
+            logging.debug(f"{gesture.name} enabled")
+
+    def _setup_actions(self):
+        """Pre-parse command actions so triggering them never involves a shell parse"""
+        for name, action_config in (self.config.get('actions') or {}).items():
+            if action_config.get('type') == 'command':
+                try:
+                    self.command_runner.register(name, action_config)
+                except ValueError as e:
+                    logging.error(str(e))
+            elif action_config.get('type') == 'scroll':
+                from actions.scroll_output import ScrollOutput
+                if self.pointer is None and not self.replay_mode:
+                    self._open_pointer()
+                self.scroll_outputs[name] = ScrollOutput(
+                    name, action_config, self.scheduler,
+                    lambda button, count, name=name: self._emit_scroll(name, button, count))
+
+    def _open_pointer(self):
+        """Connect to the X server for wheel clicks; scroll actions do nothing without it"""
+        from actions.xtest import XTestPointer
+        try:
+            self.pointer = XTestPointer()
+        except Exception as e:
+            logging.warning(f"Scroll actions disabled, cannot use XTEST: {e}")
 
     def _setup_devices(self):
         """Find and setup input devices based on config"""
+        # evdev is only needed for live devices; replay and benchmarks run without it
+        from utils.device_utils import list_devices, scan_devices, find_device_by_name, find_device_by_id
         device_configs = self.config.get('devices', [])
+        # One pass over /dev/input serves the verbose listing and every name match
+        available = []
+        if self.verbose:
+            available = list_devices(self.verbose)
+        elif any('name' in device_config for device_config in device_configs):
+            available = scan_devices()
         
         for device_config in device_configs:
             if 'name' in device_config:
-                device = find_device_by_name(device_config['name'], self.verbose)
-                if device:
-                    self.devices.append(device)
+                device = find_device_by_name(device_config['name'], self.verbose, available)
             elif 'event_id' in device_config:
                 device = find_device_by_id(device_config['event_id'], self.verbose)
-                if device:
-                    self.devices.append(device)
+            else:
+                continue
+            # evdev.InputDevice is unhashable (__eq__ without __hash__), so key by path
+            if device and device.path not in self.device_configs:
+                self.devices.append(device)
+                self.device_configs[device.path] = device_config
+
+        for device in available:
+            if not any(device is opened for opened in self.devices):
+                device.close()
+
+        if self.conditioning_enabled:
+            # Calibration (X screen query, lookup tables) is built now, not on the first touch
+            for device in self.devices:
+                self.conditioners[device.path] = self._make_conditioner(device)
 
     def start(self):
         """Start listening for input events"""
@@ -72,27 +176,224 @@ class InputListener:
             logging.error("No input devices found")
             return
 
+        # SIGUSR1 toggles pipeline profiling; the table is logged when it is switched off
+        signal.signal(signal.SIGUSR1, self._toggle_profiling)
+        self._setup_control()
+        self._setup_bus()
+        self._startup_mark('sockets')
+        # Applied from the loop thread: scheduling class and affinity are per-thread
+        self.latency = LatencyTuner(self.config.get('latency'), self.scheduler)
+        self.latency.apply()
+        self.command_runner.latency = self.latency
+        self._startup_mark('latency')
+        if self.startup is not None:
+            self.startup.log_report()
+
         try:
             # Create a select-based event loop
             from select import select
             logging.info("Starting event loop...")
             while True:
-                r, w, x = select(self.devices, [], [])
+                watched = self.devices + self.control.fileobjects() if self.control else list(self.devices)
+                if self.bus is not None:
+                    watched.append(self.bus.sock)
+                # Wake up for the next pending timer (hold deadline, ungrab, ...)
+                writers = self.control.writers() if self.control else []
+                timeout = self.scheduler.timeout()
+                if writers:
+                    # Come back to drop clients that never read their reply
+                    timeout = REPLY_TIMEOUT if timeout is None else min(timeout, REPLY_TIMEOUT)
+                r, w, x = select(watched, writers, [], timeout)
+                for conn in w:
+                    self.control.handle_writable(conn)
                 for device in r:
-                    for event in device.read():
+                    if self.control is not None and self.control.owns(device):
+                        self.control.handle_readable(device)
+                        continue
+                    if self.bus is not None and device is self.bus.sock:
+                        self.bus.handle_readable()
+                        continue
+                    if self.profiler.enabled:
+                        started = self.profiler.start()
+                        events = list(device.read())
+                        self.profiler.stop('read', started)
+                    else:
+                        events = device.read()
+                    for event in events:
                         if self.verbose:
                             logging.debug(f"Event: type={event.type}, code={event.code}, value={event.value}")
-                        self._process_event(event)
+                        self._process_event(event, device)
+                if r:
+                    self.latency.activity()
+                self.scheduler.run_due()
         except KeyboardInterrupt:
             logging.info("Stopping input listener")
         finally:
             # Clean up
             self._cancel_ungrab_timer()
+            self._cancel_safety_ungrab()
             self._ungrab_devices()
+            self._log_action_stats()
+            self.profiler.log_report()
+            for output in self.scroll_outputs.values():
+                output.cancel()
+            self.command_runner.close()
+            if self.pointer is not None:
+                self.pointer.close()
+            self.latency.close()
+            self._stop_capture()
+            if self.control is not None:
+                self.control.close()
+            if self.bus is not None:
+                self.bus.close()
             for device in self.devices:
                 device.close()
                 logging.debug(f"Closed device: {device.name}")
 
+    def replay(self, events) -> int:
+        """Feed recorded events through the pipeline in virtual time
+
+        Timers fire exactly at their virtual deadlines as the event
+        timestamps advance, so a replay is deterministic and runs as fast
+        as the recognizers allow. Actions are only recorded in
+        ``detections``; nothing is clicked, typed, run or published.
+        Returns the number of events processed.
+        """
+        count = 0
+        for event in events:
+            self.scheduler.run_until(event.timestamp())
+            self._process_event(event)
+            count += 1
+        # Let timers armed by the final events (e.g. a trailing hold) expire
+        deadline = self.scheduler.next_deadline()
+        while deadline is not None:
+            self.scheduler.run_until(deadline)
+            deadline = self.scheduler.next_deadline()
+        logging.info(f"Replayed {count} events")
+        self._log_action_stats()
+        self.profiler.log_report()
+        return count
+
+    def replay_file(self, path: str) -> int:
+        """Replay a capture file recorded with utils.capture"""
+        logging.info(f"Replaying capture: {path}")
+        return self.replay(read_capture(path))
+
+    def _setup_control(self):
+        """Open the runtime control socket unless disabled in config"""
+        if not self.control_config.get('enabled', True):
+            return
+        path = self.control_config.get('socket', DEFAULT_SOCKET)
+        try:
+            self.control = ControlServer(path, self._handle_control)
+        except OSError as e:
+            logging.warning(f"Control socket unavailable at {path}: {e}")
+
+    def _setup_bus(self):
+        """Open the gesture publish/subscribe socket unless disabled in config"""
+        if not self.bus_config.get('enabled', True):
+            return
+        path = self.bus_config.get('socket', DEFAULT_BUS_SOCKET)
+        try:
+            mode = socket_mode(self.bus_config.get('mode', 0o600))
+        except ValueError as e:
+            logging.warning(f"Invalid bus mode ({e}), using 0600")
+            mode = 0o600
+        try:
+            self.bus = GestureBus(path, int(self.bus_config.get('max_subscribers', 16)), mode)
+        except OSError as e:
+            logging.warning(f"Gesture bus unavailable at {path}: {e}")
+
+    def _handle_control(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Serve one control request; runs on the event loop thread"""
+        cmd = request.get('cmd')
+        if cmd == 'status':
+            return {'ok': True, 'status': self.status()}
+        if cmd == 'counters':
+            return {'ok': True, 'counters': self.counters()}
+        if cmd == 'log-level':
+            level = str(request.get('level', '')).upper()
+            if not isinstance(logging.getLevelName(level), int):
+                return {'ok': False, 'error': f"unknown log level: {level}"}
+            logging.getLogger().setLevel(level)
+            self.verbose = logging.getLogger().level <= logging.DEBUG
+            logging.info(f"Log level set to {level}")
+            return {'ok': True, 'level': level}
+        if cmd == 'trace':
+            self.trace.level = int(request.get('level', 0))
+            return {'ok': True, 'trace_level': self.trace.level}
+        if cmd == 'trace-dump':
+            entries = self.trace.dump(request.get('limit'))
+            if request.get('clear'):
+                self.trace.clear()
+            return {'ok': True, 'trace': entries}
+        if cmd == 'capture':
+            seconds = float(request.get('seconds', 10))
+            path = request.get('path') or time.strftime('/tmp/touchgesture-%Y%m%d-%H%M%S.tgcap')
+            self._start_capture(path, seconds)
+            return {'ok': True, 'path': path, 'seconds': seconds}
+        if cmd == 'profile':
+            enable = request.get('enabled', not self.profiler.enabled)
+            report = None
+            if enable != self.profiler.enabled:
+                report = self.profiler.report() if self.profiler.enabled else None
+                self._toggle_profiling()
+            return {'ok': True, 'profiling': self.profiler.enabled, 'report': report}
+        return {'ok': False, 'error': f"unknown command: {cmd}"}
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of the live pipeline state"""
+        return {
+            'devices': [getattr(device, 'path', str(device)) for device in self.devices],
+            'total_active_fingers': self.total_active_fingers,
+            'device_grabbed': self.device_grabbed,
+            'pending_timers': self.scheduler.pending(),
+            'active_gestures': {gesture.name: gesture.state for gesture in self.arbiter.active},
+            'log_level': logging.getLevelName(logging.getLogger().level),
+            'trace_level': self.trace.level,
+            'profiling': self.profiler.enabled,
+            'capturing': self.capture_writer.path if self.capture_writer else None,
+            'latency': self.latency.stats() if self.latency else None,
+            'startup': self.startup.report() if self.startup else None,
+        }
+
+    def counters(self) -> Dict[str, Any]:
+        """All pipeline counters, keyed by stage"""
+        return {
+            'arbiter': self.arbiter.stats(),
+            'conditioning': {str(path): conditioner.stats() for path, conditioner in self.conditioners.items()},
+            'actions': {name: throttle.stats() for name, throttle in self.action_throttles.items()},
+            'commands': self.command_runner.stats(),
+            'scroll': {name: output.stats() for name, output in self.scroll_outputs.items()},
+            'bus': self.bus.stats() if self.bus else None,
+            'logging': logging_stats(),
+        }
+
+    def _start_capture(self, path: str, seconds: float):
+        """Record raw input events to path for the next seconds"""
+        self._stop_capture()
+        self.capture_writer = CaptureWriter(path)
+        self.capture_timer = self.scheduler.call_later(seconds, self._stop_capture)
+        logging.info(f"Capturing input to {path} for {seconds}s")
+
+    def _stop_capture(self):
+        if self.capture_timer is not None:
+            self.capture_timer.cancel()
+            self.capture_timer = None
+        if self.capture_writer is not None:
+            self.capture_writer.close()
+            logging.info(f"Captured {self.capture_writer.count} events to {self.capture_writer.path}")
+            self.capture_writer = None
+
+    def _toggle_profiling(self, signum=None, frame=None):
+        """Switch pipeline profiling on or off at runtime"""
+        if self.profiler.toggle():
+            logging.info("Pipeline profiling enabled")
+        else:
+            logging.info("Pipeline profiling disabled")
+            self.profiler.log_report()
+            self.profiler.reset()
+
     def _grab_devices(self):
         """Grab all input devices to prevent system interference"""
         if not self.device_grabbed:
@@ -110,7 +411,9 @@ class InputListener:
 
     def _ungrab_devices(self):
         """Release device grab"""
+        self.grab_timeout_timer = None
         if self.device_grabbed:
+            self._cancel_safety_ungrab()
             try:
                 for device in self.devices:
                     device.ungrab()
@@ -129,16 +432,15 @@ class InputListener:
     def _schedule_ungrab(self, delay=0.1):
         """Schedule device ungrab after a short delay"""
         self._cancel_ungrab_timer()
-        self.grab_timeout_timer = threading.Timer(delay, self._ungrab_devices)
-        self.grab_timeout_timer.start()
+        self.grab_timeout_timer = self.scheduler.call_later(delay, self._ungrab_devices)
         if self.verbose:
             logging.debug(f"Scheduled device ungrab in {delay}s")
 
-    def _update_finger_count(self, event):
+    def _update_finger_count(self, event_type: int, event_code: int, event_value: int):
         """Track total active fingers across all devices"""
-        if event.code == 57:  # ABS_MT_TRACKING_ID
+        if event_type == 3 and event_code == 57:  # EV_ABS / ABS_MT_TRACKING_ID
             old_count = self.total_active_fingers
-            if event.value >= 0:  # Finger down
+            if event_value >= 0:  # Finger down
                 self.total_active_fingers += 1
             else:  # Finger up
                 self.total_active_fingers = max(0, self.total_active_fingers - 1)
@@ -159,25 +461,176 @@ class InputListener:
                 if self.verbose:
                     logging.debug(f"Still {self.total_active_fingers} fingers down, keeping devices grabbed")
 
-    def _process_event(self, event):
-        """Process an input event through all gesture recognizers"""
-        # Update finger count tracking
-        self._update_finger_count(event)
-        
-        for gesture in self.gestures:
-            if self.verbose:
-                logging.debug(f"Processing event for {gesture.__class__.__name__}")
-            if gesture.process_event(event.type, event.code, event.value):
-                if self.verbose:
-                    logging.debug(f"Gesture recognized: {gesture.__class__.__name__}")
-                    logging.debug(f"Action to trigger: {gesture.action}")
-                self._trigger_action(gesture.action)
+    def _process_event(self, event, device=None):
+        """Process a raw input event through conditioning and the gesture recognizers"""
+        if self.capture_writer is not None:
+            self.capture_writer.write(event)
+        profiler = self.profiler if self.profiler.enabled else None
+        path = device.path if device is not None else None
+        if not self.conditioning_enabled:
+            self._process_raw_event(event, path, profiler)
+            return
+
+        conditioner = self.conditioners.get(path)
+        if conditioner is None:
+            # Live devices get theirs in _setup_devices; replay creates it on the first event
+            conditioner = self.conditioners[path] = self._make_conditioner(device)
+        if profiler is not None:
+            started = profiler.start()
+            frame = conditioner.feed(event)
+            profiler.stop('conditioning', started)
+        else:
+            frame = conditioner.feed(event)
+        if frame and frame[0] == (EV_SYN, SYN_DROPPED, 0):
+            # Reset before region arming so re-emitted contacts start a fresh sequence.
+            # Only this device's contacts follow; the other devices' are still down
+            self._reset_after_overrun(self._contacts_elsewhere(conditioner))
+            frame = frame[1:]
+        if frame and self.regions and self.total_active_fingers == 0:
+            self._arm_regions(frame, device)
+        for event_type, event_code, event_value in frame:
+            self._dispatch(event_type, event_code, event_value, profiler)
+
+    def _contacts_elsewhere(self, conditioner: InputConditioner) -> int:
+        """Contacts down on every device but this conditioner's"""
+        # Kept out of _process_event: a generator there turns conditioner into a cell on every event
+        return sum(other.active_contacts() for other in self.conditioners.values() if other is not conditioner)
+
+    def _process_raw_event(self, event, path: Optional[str], profiler):
+        """Dispatch an unconditioned event; after SYN_DROPPED skip the partial frame up to SYN_REPORT
+
+        There is no slot state to resync from, so contacts still down after
+        an overrun are only seen again once they lift.
+        """
+        if event.type == EV_SYN:
+            if event.code == SYN_DROPPED:
+                self.raw_dropping.add(path)
+                self._reset_after_overrun()
+                return
+            if path in self.raw_dropping and event.code == SYN_REPORT:
+                self.raw_dropping.discard(path)
+                return
+        if path in self.raw_dropping:
+            return
+        self._dispatch(event.type, event.code, event.value, profiler)
+
+    def _arm_regions(self, frame, device):
+        """At the first touch of a sequence, arm only gestures bound to the touched regions"""
+        point = touch_down_point(frame)
+        if point is None:
+            return
+        path = device.path if device is not None else None
+        index = self.region_indexes.get(path)
+        if index is None:
+            regions = [region for region in self.regions if region.applies_to(device)]
+            index = self.region_indexes[path] = RegionIndex(regions)
+        hits = index.lookup(*point)
+        if self.trace.level >= TRACE_GESTURES:
+            self.trace.record(self.scheduler.now(), 'regions', {'point': point, 'regions': hits})
+        self.arbiter.arm(hits)
+
+    def _make_conditioner(self, device) -> InputConditioner:
+        """Create the conditioning stage, with its precomputed calibration, for a device"""
+        if device is None:
+            # Replay has no device: use the first configured device's calibration
+            device_configs = self.config.get('devices') or [{}]
+            device_config = device_configs[0]
+        else:
+            device_config = self.device_configs.get(device.path, {})
+        try:
+            transform = build_transform(device, device_config.get('calibration'))
+        except ValueError as e:
+            logging.error(f"Invalid calibration: {e}")
+            transform = None
+        # After SYN_DROPPED the slot state is read back from the kernel in one step
+        resync = (lambda fd=device.fileno(): query_mt_slots(fd)) if device is not None else None
+        return InputConditioner(self.conditioning_config, transform, resync)
+
+    def _dispatch(self, event_type: int, event_code: int, event_value: int, profiler=None):
+        """Run one conditioned event through finger counting and the arbiter"""
+        if profiler is not None:
+            started = profiler.start()
+            self._update_finger_count(event_type, event_code, event_value)
+            profiler.stop('finger_count', started)
+        else:
+            self._update_finger_count(event_type, event_code, event_value)
+        if self.trace.level >= TRACE_EVENTS:
+            self.trace.record(self.scheduler.now(), 'event', (event_type, event_code, event_value))
+
+        # Recognizers report through the arbiter callback, never via the return value,
+        # so a recognition results in exactly one action
+        self.arbiter.dispatch(event_type, event_code, event_value, profiler)
+
+        if event_code == 57:  # ABS_MT_TRACKING_ID
+            if event_value < 0 and self.total_active_fingers == 0:
+                # Re-arm every recognizer once the last finger has lifted
+                self.arbiter.end_sequence()
+            elif event_value >= 0 and self.total_active_fingers == 1:
+                # Touching the screen stops kinetic scrolling
+                for output in self.scroll_outputs.values():
+                    output.halt()
+
+    def _reset_after_overrun(self, still_down: int = 0):
+        """Events were lost on one device: reset recognition so nothing stays stuck
 
-    def _trigger_action(self, action_name: str):
-        """Trigger the configured action"""
+        ``still_down`` counts the other devices' contacts, which are unaffected.
+        The conditioner follows with the overrunning device's resynced
+        contacts as fresh touches, which complete the finger count and
+        restart recognition.
+        """
+        logging.debug("Resetting recognizers and finger count after input overrun")
+        if self.trace.level >= TRACE_GESTURES:
+            self.trace.record(self.scheduler.now(), 'overrun', self.total_active_fingers)
+        self.arbiter.reset()
+        self.total_active_fingers = still_down
+        if self.device_grabbed and still_down == 0:
+            self._schedule_ungrab()
+
+    def _submit_action(self, action_name: str):
+        """Pass a trigger through the action's debounce/rate limit/coalescing gate"""
+        throttle = self.action_throttles.get(action_name)
+        if throttle is None:
+            action_config = self._action_config(action_name) or {}
+            throttle = ActionThrottle(action_name, action_config, self.scheduler, self._execute_action)
+            self.action_throttles[action_name] = throttle
+        throttle.submit()
+
+    def _execute_action(self, action_name: str, count: int):
+        """Run an action that passed its throttle, shielding the event loop from errors"""
+        if self.trace.level >= TRACE_GESTURES:
+            self.trace.record(self.scheduler.now(), 'action', {'name': action_name, 'count': count})
+        started = self.profiler.start() if self.profiler.enabled else None
+        try:
+            self._trigger_action(action_name, count)
+        except Exception as e:
+            logging.error(f"Error executing action {action_name}: {e}")
+        if started is not None:
+            self.profiler.stop(f"action:{action_name}", started)
+
+    def _log_action_stats(self):
+        """Log per-action trigger counters"""
+        stats = ", ".join(f"{k}={v}" for k, v in self.arbiter.stats().items())
+        logging.info(f"Arbiter: {stats}")
+        for path, conditioner in self.conditioners.items():
+            conditioner.log_stats(path or '')
+        for name, throttle in self.action_throttles.items():
+            stats = ", ".join(f"{k}={v}" for k, v in throttle.stats().items())
+            logging.info(f"Action {name}: {stats}")
+        for name, command_stats in self.command_runner.stats().items():
+            stats = ", ".join(f"{k}={v}" for k, v in command_stats.items())
+            logging.info(f"Command {name}: {stats}")
+        for name, output in self.scroll_outputs.items():
+            stats = ", ".join(f"{k}={v}" for k, v in output.stats().items())
+            logging.info(f"Scroll {name}: {stats}")
+
+    def _trigger_action(self, action_name: str, count: int = 1):
+        """Trigger the configured action, repeating its effect count times where supported"""
+        if self.replay_mode:
+            self.detections.append((action_name, self.scheduler.now(), count))
+            return
         if self.verbose:
             logging.debug(f"Looking up action: {action_name}")
-        action_config = self.config.get('actions', {}).get(action_name)
+        action_config = self._action_config(action_name)
         if not action_config:
             if self.verbose:
                 logging.debug(f"No action configuration found for: {action_name}")
@@ -185,29 +638,36 @@ class InputListener:
 
         action_type = action_config.get('type')
         if self.verbose:
-            logging.debug(f"Triggering action: {action_name} (type: {action_type})")
+            logging.debug(f"Triggering action: {action_name} (type: {action_type}, count: {count})")
             logging.debug(f"Action config: {action_config}")
 
         if action_type == 'mouse':
-            self._trigger_mouse_action(action_config)
+            self._trigger_mouse_action(action_config, count)
         elif action_type == 'keyboard':
-            self._trigger_keyboard_action(action_config)
+            self._trigger_keyboard_action(action_config, count, action_name.partition(':')[2])
         elif action_type == 'command':
-            self._trigger_command_action(action_config)
+            self._trigger_command_action(action_name.partition(':')[0], count)
+        elif action_type == 'publish':
+            # Delivered to bus subscribers only, which happens for every gesture
+            pass
         else:
             if self.verbose:
                 logging.debug(f"Unknown action type: {action_type}")
 
-    def _trigger_mouse_action(self, config: Dict[str, Any]):
+    def _trigger_mouse_action(self, config: Dict[str, Any], count: int = 1):
         """Trigger a mouse action using xdotool"""
         import subprocess
         button = config.get('button', 'left')
         event = config.get('event', 'click')
-        cmd = ['xdotool', f'mouse{event}', button]
+        cmd = ['xdotool', f'mouse{event}']
+        if count > 1 and event == 'click':
+            cmd += ['--repeat', str(count)]
+        cmd.append(button)
         if self.verbose:
             logging.debug(f"Executing mouse command: {' '.join(cmd)}")
         try:
-            subprocess.run(cmd, check=True)
+            with self.command_runner.spawning():
+                subprocess.run(cmd, check=True)
             if self.verbose:
                 logging.debug("Mouse command executed successfully")
         except subprocess.CalledProcessError as e:
@@ -215,61 +675,101 @@ class InputListener:
         except Exception as e:
             logging.error(f"Unexpected error executing mouse command: {e}")
 
-    def _trigger_keyboard_action(self, config: Dict[str, Any]):
-        """Trigger a keyboard action using xdotool"""
+    def _action_config(self, action_name: str) -> Optional[Dict[str, Any]]:
+        """Look up an action; a ``:variant`` suffix (e.g. ``zoom:out``) selects a variant of the same action"""
+        return (self.config.get('actions') or {}).get(action_name.partition(':')[0])
+
+    def _trigger_keyboard_action(self, config: Dict[str, Any], count: int = 1, variant: str = ''):
+        """Trigger a keyboard action using xdotool; the variant picks its key combination (in/out)"""
         import subprocess
-        keys = config.get('in', '').split('+')
-        cmd = ['xdotool', 'key'] + keys
+        keys = config.get(variant or 'in', config.get('in', '')).split('+')
+        cmd = ['xdotool', 'key']
+        if count > 1:
+            cmd += ['--repeat', str(count)]
+        cmd += keys
         if self.verbose:
             logging.debug(f"Executing keyboard command: {' '.join(cmd)}")
-        subprocess.run(cmd)
+        with self.command_runner.spawning():
+            subprocess.run(cmd)
 
-    def _trigger_command_action(self, config: Dict[str, Any]):
-        """Trigger a shell command"""
-        import subprocess
-        command = config.get('command', '')
-        if command:
-            if self.verbose:
-                logging.debug(f"Executing shell command: {command}")
-            subprocess.run(command, shell=True)
+    def _trigger_command_action(self, action_name: str, count: int = 1):
+        """Start a command action; merged triggers are passed as TOUCHGESTURE_COUNT"""
+        if self.verbose:
+            logging.debug(f"Executing command action: {action_name}")
+        self.command_runner.run(action_name, count)
 
     def _on_gesture_detected(self, action_name: str):
         """Handle gesture detection callback"""
         if self.verbose:
             logging.debug(f"Gesture callback received for action: {action_name}")
         
-        # Grab devices to prevent interference
-        self._grab_devices()
-        
-        try:
-            # Trigger the action
-            self._trigger_action(action_name)
-        except Exception as e:
-            logging.error(f"Error executing action {action_name}: {e}")
-        finally:
-            # Don't ungrab immediately - wait for fingers to be released
-            # The ungrab will happen automatically when finger count reaches 0
-            if self.verbose:
-                logging.debug("Action completed, will ungrab when fingers are released")
+        if self.trace.level >= TRACE_GESTURES:
+            self.trace.record(self.scheduler.now(), 'gesture', action_name)
+        if self.bus is not None:
+            self.bus.publish(KIND_GESTURE, action_name, self.scheduler.now())
+
+        # Grab devices to prevent interference; taps resolve after the fingers are gone
+        if self.total_active_fingers > 0:
+            self._grab_devices()
+
+        scroll_output = self.scroll_outputs.get(action_name)
+        if scroll_output is not None:
+            # Continuous gesture: deltas follow through _on_gesture_update
+            scroll_output.begin()
+            return
+
+        # Trigger the action; errors are contained in _execute_action
+        self._submit_action(action_name)
+
+        # Don't ungrab immediately - wait for fingers to be released
+        # The ungrab will happen automatically when finger count reaches 0
+        if self.verbose:
+            logging.debug("Action submitted, will ungrab when fingers are released")
+
+    def _on_gesture_update(self, action_name: str, phase: str, x: float, y: float):
+        """Feed a continuous gesture's per-frame delta or release velocity to its output"""
+        if self.bus is not None:
+            self.bus.publish(KIND_END if phase == PHASE_END else KIND_UPDATE, action_name,
+                             self.scheduler.now(), x, y)
+        scroll_output = self.scroll_outputs.get(action_name)
+        if scroll_output is None:
+            return
+        if phase == PHASE_END:
+            scroll_output.release(x, y)
+        else:
+            scroll_output.add(x, y)
+
+    def _emit_scroll(self, action_name: str, button: int, count: int):
+        """Send one batch of wheel clicks through XTEST"""
+        if self.trace.level >= TRACE_GESTURES:
+            self.trace.record(self.scheduler.now(), 'scroll', {'name': action_name, 'button': button, 'count': count})
+        if self.replay_mode:
+            self.detections.append((f"{action_name}:button{button}", self.scheduler.now(), count))
+            return
+        if self.pointer is not None:
+            self.pointer.click(button, count)
 
     def _schedule_ungrab_after_action(self):
         """Schedule device ungrab after action"""
-        import threading
         self._cancel_ungrab_timer()
         # Use a shorter delay for post-action ungrab to ensure responsiveness
-        self.grab_timeout_timer = threading.Timer(0.05, self._ungrab_devices)
-        self.grab_timeout_timer.start()
+        self.grab_timeout_timer = self.scheduler.call_later(0.05, self._ungrab_devices)
         if self.verbose:
             logging.debug("Scheduled device ungrab after action in 0.05s")
 
     def _schedule_safety_ungrab(self):
         """Schedule a safety ungrab after 5 seconds to prevent permanent device grab"""
-        import threading
         def safety_ungrab():
+            self.safety_ungrab_timer = None
             if self.device_grabbed:
                 logging.warning("Safety ungrab triggered - devices were grabbed for too long")
                 self._ungrab_devices()
-        
-        safety_timer = threading.Timer(5.0, safety_ungrab)
-        safety_timer.daemon = True  # Don't prevent program exit
-        safety_timer.start() 
\ No newline at end of file
+
+        self._cancel_safety_ungrab()
+        self.safety_ungrab_timer = self.scheduler.call_later(5.0, safety_ungrab)
+
+    def _cancel_safety_ungrab(self):
+        """Cancel the pending safety ungrab, if any"""
+        if self.safety_ungrab_timer:
+            self.safety_ungrab_timer.cancel()
+            self.safety_ungrab_timer = None 
\ No newline at end of file
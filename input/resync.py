@@ -0,0 +1,55 @@
+import array
+import fcntl
+import struct
+from typing import List, Tuple
+
+ABS_MT_SLOT = 47
+ABS_MT_POSITION_X = 53
+ABS_MT_POSITION_Y = 54
+ABS_MT_TRACKING_ID = 57
+
+# (current slot, [(tracking_id, x, y) for every slot])
+MTSnapshot = Tuple[int, List[Tuple[int, int, int]]]
+
+_IOC_READ = 2
+_ABSINFO = struct.Struct('6i')  # value, minimum, maximum, fuzz, flat, resolution
+
+
+def _ioc_read(nr: int, size: int) -> int:
+    return (_IOC_READ << 30) | (size << 16) | (ord('E') << 8) | nr
+
+
+def EVIOCGABS(code: int) -> int:
+    return _ioc_read(0x40 + code, _ABSINFO.size)
+
+
+def EVIOCGMTSLOTS(length: int) -> int:
+    return _ioc_read(0x0a, length)
+
+
+def _absinfo(fd: int, code: int) -> Tuple[int, ...]:
+    buffer = bytearray(_ABSINFO.size)
+    fcntl.ioctl(fd, EVIOCGABS(code), buffer)
+    return _ABSINFO.unpack(buffer)
+
+
+def _slot_values(fd: int, code: int, num_slots: int) -> List[int]:
+    # struct input_mt_request_layout { __u32 code; __s32 values[num_slots]; }
+    buffer = array.array('i', [code] + [0] * num_slots)
+    fcntl.ioctl(fd, EVIOCGMTSLOTS(buffer.itemsize * len(buffer)), buffer)
+    return buffer.tolist()[1:]
+
+
+def query_mt_slots(fd: int) -> MTSnapshot:
+    """Read the complete multitouch slot state of an evdev device from the kernel
+
+    Three EVIOCGMTSLOTS calls (tracking ID, X, Y) plus one EVIOCGABS for the
+    current slot return the state the kernel would have reported had no
+    events been dropped.
+    """
+    current, _, maximum = _absinfo(fd, ABS_MT_SLOT)[:3]
+    num_slots = maximum + 1
+    ids = _slot_values(fd, ABS_MT_TRACKING_ID, num_slots)
+    xs = _slot_values(fd, ABS_MT_POSITION_X, num_slots)
+    ys = _slot_values(fd, ABS_MT_POSITION_Y, num_slots)
+    return current, list(zip(ids, xs, ys))
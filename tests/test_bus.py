@@ -0,0 +1,30 @@
+import os
+import stat
+
+import pytest
+
+from actions.bus import GestureBus, socket_mode
+
+
+def test_quoted_mode_is_octal():
+    assert socket_mode("0600") == 0o600
+    assert socket_mode("0660") == 0o660
+
+
+def test_yaml_octal_int_passes_through():
+    assert socket_mode(0o666) == 0o666
+
+
+@pytest.mark.parametrize('value', ["600x", "0800", 0o1777, True, 6.0, None])
+def test_invalid_mode_is_rejected(value):
+    with pytest.raises(ValueError):
+        socket_mode(value)
+
+
+def test_bus_socket_gets_configured_permissions(tmp_path):
+    path = str(tmp_path / 'bus.sock')
+    bus = GestureBus(path, mode=socket_mode("0640"))
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    finally:
+        bus.close()
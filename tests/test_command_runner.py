@@ -0,0 +1,48 @@
+import pytest
+
+from actions.command_runner import CommandSpec
+
+
+def _argv(command: str, **config):
+    return CommandSpec('test', dict(config, command=command)).argv
+
+
+@pytest.mark.parametrize('command', [
+    'xdotool key ctrl+c;notify-send done',
+    'echo hi>/tmp/x',
+    'cat</tmp/x',
+    'a&&b',
+    'xdotool key ctrl+c|tee log',
+    'sleep 1&',
+    'echo $HOME',
+    'echo `date`',
+    '(cd /tmp && ls)',
+    '~/bin/toggle.sh',
+    'ls *.png',
+    'ls shot?.png',
+    'ls [ab].png',
+    'echo {a,b}',
+    'FOO=1 cmd',
+    'echo done # comment',
+])
+def test_shell_syntax_runs_through_sh(command):
+    assert _argv(command) == ['/bin/sh', '-c', command]
+
+
+@pytest.mark.parametrize('command, argv', [
+    ('xdotool key ctrl+c', ['xdotool', 'key', 'ctrl+c']),
+    ('notify-send "Gesture done" --urgency=low', ['notify-send', 'Gesture done', '--urgency=low']),
+    ('/usr/bin/env', ['/usr/bin/env']),
+    ('xdotool key super+Page_Up', ['xdotool', 'key', 'super+Page_Up']),
+])
+def test_plain_commands_are_split_without_a_shell(command, argv):
+    assert _argv(command) == argv
+
+
+def test_shell_true_always_uses_sh():
+    assert _argv('xdotool key ctrl+c', shell=True) == ['/bin/sh', '-c', 'xdotool key ctrl+c']
+
+
+def test_unbalanced_quotes_are_a_config_error():
+    with pytest.raises(ValueError):
+        _argv('notify-send "oops')
@@ -0,0 +1,98 @@
+from input.listener import InputListener
+from utils.capture import CaptureEvent
+
+EV_SYN, EV_ABS = 0, 3
+ABS_MT_SLOT, ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_TRACKING_ID = 47, 53, 54, 57
+
+
+class FakeDevice:
+    """Stands in for evdev.InputDevice, which defines __eq__ but not __hash__"""
+
+    def __init__(self, path: str, name: str = 'Fake Touchscreen'):
+        self.path = path
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDevice) and self.path == other.path
+
+    def fileno(self) -> int:
+        return -1
+
+    def absinfo(self, code):
+        raise OSError("no absinfo")
+
+
+def _event(t: float, type_: int, code: int, value: int) -> CaptureEvent:
+    return CaptureEvent(int(t), int(round((t - int(t)) * 1e6)), type_, code, value)
+
+
+def _touch_down(t: float, x: int, y: int):
+    return [_event(t, EV_ABS, ABS_MT_SLOT, 0), _event(t, EV_ABS, ABS_MT_TRACKING_ID, 1),
+            _event(t, EV_ABS, ABS_MT_POSITION_X, x), _event(t, EV_ABS, ABS_MT_POSITION_Y, y),
+            _event(t, EV_SYN, 0, 0)]
+
+
+def _listener(config=None) -> InputListener:
+    config = dict(config or {})
+    config.setdefault('conditioning', {'enabled': True})
+    config.setdefault('control', {'enabled': False})
+    return InputListener(None, replay=True, config=config)
+
+
+def test_fake_device_is_unhashable_like_evdev():
+    assert FakeDevice.__hash__ is None
+
+
+def test_calibration_is_looked_up_by_device_path():
+    listener = _listener()
+    device = FakeDevice('/dev/input/event7')
+    listener.device_configs[device.path] = {'calibration': {
+        'x_range': [0, 4095], 'y_range': [0, 4095], 'width': 800, 'height': 480, 'rotation': 90}}
+    conditioner = listener._make_conditioner(device)
+    assert conditioner.transform is not None
+    assert conditioner.transform.width == 800
+
+
+def test_conditioners_are_keyed_by_device_path():
+    listener = _listener()
+    device = FakeDevice('/dev/input/event7')
+    for event in _touch_down(1.0, 100, 200):
+        listener._process_event(event, device)
+    assert list(listener.conditioners) == ['/dev/input/event7']
+    assert listener.total_active_fingers == 1
+    assert '/dev/input/event7' in listener.counters()['conditioning']
+
+
+def test_region_indexes_are_keyed_by_device_path():
+    fired = []
+    listener = _listener({
+        'regions': {'left': {'rect': [0, 0, 400, 480]},
+                    'other_panel': {'rect': [0, 0, 800, 480], 'device': 'Other'}},
+        'gestures': {'tap': {'enabled': True, 'region': 'left',
+                             'bindings': [{'fingers': 1, 'taps': 1, 'action': 'left_tap'}]}},
+    })
+    listener._trigger_action = lambda name, count=1: fired.append(name)
+    device = FakeDevice('/dev/input/event7')
+    events = _touch_down(1.0, 100, 200) + [_event(1.05, EV_ABS, ABS_MT_TRACKING_ID, -1), _event(1.05, EV_SYN, 0, 0)]
+    for event in events:
+        listener._process_event(event, device)
+    listener.scheduler.run_until(2.0)
+    assert list(listener.region_indexes) == ['/dev/input/event7']
+    assert [region.name for region in listener.region_indexes['/dev/input/event7'].regions] == ['left']
+    assert fired == ['left_tap']
+
+
+def test_region_bound_gestures_are_disabled_without_conditioning():
+    fired = []
+    listener = _listener({
+        'conditioning': {'enabled': False},
+        'regions': {'topbar': {'rect': [0, 0, 800, 40]}},
+        'gestures': {'tap_topbar': {'type': 'tap', 'enabled': True, 'region': 'topbar',
+                                    'bindings': [{'fingers': 1, 'taps': 1, 'action': 'topbar_tap'}]},
+                     'tap': {'enabled': True, 'bindings': [{'fingers': 1, 'taps': 1, 'action': 'tap'}]}},
+    })
+    listener._trigger_action = lambda name, count=1: fired.append(name)
+    events = _touch_down(1.0, 400, 400) + [_event(1.05, EV_ABS, ABS_MT_TRACKING_ID, -1), _event(1.05, EV_SYN, 0, 0)]
+    listener.replay(events)
+    assert [gesture.name for gesture in listener.gestures] == ['TapGesture']
+    assert fired == ['tap']
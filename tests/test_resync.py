@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+from input.conditioning import InputConditioner, EV_SYN, SYN_DROPPED
+from input.listener import InputListener
+from input.resync import MTSnapshot
+from utils.capture import CaptureEvent
+
+EV_ABS = 3
+ABS_MT_SLOT, ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_TRACKING_ID = 47, 53, 54, 57
+
+
+def _event(t: float, type_: int, code: int, value: int) -> CaptureEvent:
+    return CaptureEvent(int(t), int(round((t - int(t)) * 1e6)), type_, code, value)
+
+
+def _down(t: float, tracking_id: int, x: int, y: int):
+    return [_event(t, EV_ABS, ABS_MT_SLOT, 0), _event(t, EV_ABS, ABS_MT_TRACKING_ID, tracking_id),
+            _event(t, EV_ABS, ABS_MT_POSITION_X, x), _event(t, EV_ABS, ABS_MT_POSITION_Y, y),
+            _event(t, EV_SYN, 0, 0)]
+
+
+def _up(t: float):
+    return [_event(t, EV_ABS, ABS_MT_SLOT, 0), _event(t, EV_ABS, ABS_MT_TRACKING_ID, -1), _event(t, EV_SYN, 0, 0)]
+
+
+def _overrun(rate: int = 120):
+    """Two fingers down, then an input overrun during which the second finger lifts
+
+    The lift is lost with the dropped events. Returns the stream and the
+    slot state the kernel reports after the overrun, for a fake resync:
+    the first finger is still down, the second is gone. The first finger
+    keeps moving and lifts normally at the end.
+    """
+    start = 1000.0
+    events = []
+    for i in range(10):
+        t = start + i / rate
+        for slot, tracking_id, x in ((0, 1, 1000 + i), (1, 2, 1400 - i)):
+            events.append(_event(t, EV_ABS, ABS_MT_SLOT, slot))
+            if i == 0:
+                events.append(_event(t, EV_ABS, ABS_MT_TRACKING_ID, tracking_id))
+            events += [_event(t, EV_ABS, ABS_MT_POSITION_X, x), _event(t, EV_ABS, ABS_MT_POSITION_Y, 1000)]
+        events.append(_event(t, EV_SYN, 0, 0))
+    # Only the end of a frame survives the overrun; it is discarded up to its SYN_REPORT
+    t = start + 10 / rate
+    events += [_event(t, EV_SYN, SYN_DROPPED, 0), _event(t, EV_ABS, ABS_MT_POSITION_X, 1012), _event(t, EV_SYN, 0, 0)]
+    snapshot: MTSnapshot = (0, [(1, 1012, 1000), (-1, 1390, 1000)])
+    for i in range(11, 20):
+        t = start + i / rate
+        events += [_event(t, EV_ABS, ABS_MT_SLOT, 0), _event(t, EV_ABS, ABS_MT_POSITION_X, 1002 + i),
+                   _event(t, EV_SYN, 0, 0)]
+    events += _up(start + 20 / rate)
+    return events, snapshot
+
+
+def _feed(listener: InputListener, events, device):
+    for event in events:
+        listener._process_event(event, device)
+
+
+def _listener_with_resync(snapshot, config=None) -> InputListener:
+    config = dict(config or {})
+    config.setdefault('conditioning', {'enabled': True})
+    config.setdefault('control', {'enabled': False})
+    listener = InputListener(None, replay=True, config=config)
+    # Replay has no device to query; the conditioner for it gets the synthetic slot state
+    listener.conditioners[None] = InputConditioner(listener.conditioning_config, None, lambda: snapshot)
+    return listener
+
+
+def test_overrun_discards_up_to_syn_report_and_rebuilds_from_resync():
+    events, snapshot = _overrun()
+    conditioner = InputConditioner({}, None, lambda: snapshot)
+    frames = [frame for frame in (conditioner.feed(event) for event in events) if frame]
+    resynced = next(frame for frame in frames if frame[0] == (EV_SYN, SYN_DROPPED, 0))
+    # The surviving contact comes back as a fresh touch; the lifted one does not
+    new_touches = [event for event in resynced if event[:2] == (EV_ABS, ABS_MT_TRACKING_ID) and event[2] >= 0]
+    assert len(new_touches) == 1
+    assert (EV_ABS, ABS_MT_SLOT, 0) in resynced
+    assert conditioner.overruns == 1
+    assert conditioner.discarded == 1
+    assert conditioner.active_contacts() == 0
+
+
+def test_lift_lost_in_overrun_leaves_no_stuck_finger():
+    events, snapshot = _overrun()
+    listener = _listener_with_resync(snapshot)
+    drop = next(i for i, event in enumerate(events) if (event.type, event.code) == (EV_SYN, SYN_DROPPED))
+    listener.replay(events[:drop])
+    assert listener.total_active_fingers == 2
+    # Overrun plus the discarded partial frame up to its SYN_REPORT
+    listener.replay(events[drop:drop + 3])
+    assert listener.total_active_fingers == 1
+    listener.replay(events[drop + 3:])
+    assert listener.total_active_fingers == 0
+    assert listener.conditioners[None].active_contacts() == 0
+
+
+def test_contact_still_down_after_overrun_is_a_fresh_touch():
+    events, snapshot = _overrun()
+    fired = []
+    listener = _listener_with_resync(snapshot, {
+        'gestures': {'tap': {'enabled': True, 'max_duration': 0.5,
+                             'bindings': [{'fingers': 1, 'taps': 1, 'action': 'tap'}]}},
+    })
+    listener._trigger_action = lambda name, count=1: fired.append(name)
+    listener.replay(events)
+    # After the reset the remaining finger is a new one-finger touch, so its lift is a tap
+    assert fired == ['tap']
+
+
+def test_overrun_on_one_device_keeps_the_other_devices_fingers():
+    listener = _listener_with_resync(None)
+    first, second = SimpleNamespace(path='/dev/input/event5'), SimpleNamespace(path='/dev/input/event6')
+    for device in (first, second):
+        # After the overrun the kernel still reports the second device's finger
+        listener.conditioners[device.path] = InputConditioner(
+            listener.conditioning_config, None, lambda: (0, [(20, 300, 300)]))
+    _feed(listener, _down(1.0, 10, 100, 100), first)
+    _feed(listener, _down(1.1, 20, 300, 300), second)
+    assert listener.total_active_fingers == 2
+    _feed(listener, [_event(1.2, EV_SYN, SYN_DROPPED, 0), _event(1.2, EV_SYN, 0, 0)], second)
+    assert listener.total_active_fingers == 2
+    _feed(listener, _up(1.3), first)
+    assert listener.total_active_fingers == 1
+    _feed(listener, _up(1.4), second)
+    assert listener.total_active_fingers == 0
+
+
+def test_unconditioned_overrun_discards_the_partial_frame():
+    listener = InputListener(None, replay=True, config={'conditioning': {'enabled': False},
+                                                        'control': {'enabled': False}})
+    events = (_down(1.0, 10, 100, 100)
+              + [_event(1.1, EV_SYN, SYN_DROPPED, 0), _event(1.1, EV_ABS, ABS_MT_SLOT, 1),
+                 _event(1.1, EV_ABS, ABS_MT_TRACKING_ID, 11), _event(1.1, EV_SYN, 0, 0)])
+    listener.replay(events)
+    # The touch in the partial frame never reaches the finger count
+    assert listener.total_active_fingers == 0
+    assert listener.raw_dropping == set()
@@ -0,0 +1,96 @@
+from input.listener import InputListener
+from utils.capture import CaptureEvent
+
+EV_SYN, EV_ABS = 0, 3
+ABS_MT_SLOT, ABS_MT_POSITION_X, ABS_MT_POSITION_Y, ABS_MT_TRACKING_ID = 47, 53, 54, 57
+INTERVAL = 0.3
+
+
+def _event(t: float, type_: int, code: int, value: int) -> CaptureEvent:
+    return CaptureEvent(int(t), int(round((t - int(t)) * 1e6)), type_, code, value)
+
+
+class _Taps:
+    """Builds a stream of taps with fresh tracking IDs"""
+
+    def __init__(self):
+        self.events = []
+        self.next_id = 1
+
+    def tap(self, t: float, x: int = 400, y: int = 240, fingers: int = 1, duration: float = 0.05):
+        for slot in range(fingers):
+            self.events += [_event(t, EV_ABS, ABS_MT_SLOT, slot), _event(t, EV_ABS, ABS_MT_TRACKING_ID, self.next_id),
+                            _event(t, EV_ABS, ABS_MT_POSITION_X, x + 30 * slot),
+                            _event(t, EV_ABS, ABS_MT_POSITION_Y, y)]
+            self.next_id += 1
+        self.events.append(_event(t, EV_SYN, 0, 0))
+        lift = t + duration
+        for slot in range(fingers):
+            self.events += [_event(lift, EV_ABS, ABS_MT_SLOT, slot), _event(lift, EV_ABS, ABS_MT_TRACKING_ID, -1)]
+        self.events.append(_event(lift, EV_SYN, 0, 0))
+        return self
+
+
+def _replay(taps: _Taps, bindings):
+    listener = InputListener(None, replay=True, config={
+        'control': {'enabled': False},
+        'gestures': {'tap': {'enabled': True, 'interval': INTERVAL, 'slop': 40, 'bindings': bindings}},
+    })
+    listener.replay(taps.events)
+    return [(action, round(t - 1000.0, 3)) for action, t, count in listener.detections]
+
+
+SINGLE_AND_DOUBLE = [{'fingers': 1, 'taps': 1, 'action': 'single'},
+                     {'fingers': 1, 'taps': 2, 'action': 'double'},
+                     {'fingers': 2, 'taps': 1, 'action': 'two_finger'}]
+
+
+def test_single_tap_waits_for_the_interval_when_a_double_tap_is_bound():
+    assert _replay(_Taps().tap(1000.0), SINGLE_AND_DOUBLE) == [('single', 0.35)]
+
+
+def test_double_tap_resolves_on_the_second_lift():
+    taps = _Taps().tap(1000.0).tap(1000.2)
+    assert _replay(taps, SINGLE_AND_DOUBLE) == [('double', 0.25)]
+
+
+def test_tap_resolves_immediately_without_a_higher_binding():
+    assert _replay(_Taps().tap(1000.0), [{'fingers': 1, 'taps': 1, 'action': 'single'}]) == [('single', 0.05)]
+
+
+def test_interval_breaks_the_chain():
+    taps = _Taps().tap(1000.0).tap(1000.5)
+    assert _replay(taps, SINGLE_AND_DOUBLE) == [('single', 0.35), ('single', 0.85)]
+
+
+def test_slop_breaks_the_chain():
+    taps = _Taps().tap(1000.0, x=400).tap(1000.2, x=500)
+    assert _replay(taps, SINGLE_AND_DOUBLE) == [('single', 0.25), ('single', 0.55)]
+
+
+def test_finger_count_breaks_the_chain():
+    taps = _Taps().tap(1000.0).tap(1000.2, fingers=2)
+    assert _replay(taps, SINGLE_AND_DOUBLE) == [('single', 0.25), ('two_finger', 0.25)]
+
+
+def test_moving_touch_is_not_a_tap_and_ends_the_chain():
+    taps = _Taps().tap(1000.0)
+    taps.events += [_event(1000.2, EV_ABS, ABS_MT_SLOT, 0), _event(1000.2, EV_ABS, ABS_MT_TRACKING_ID, 99),
+                    _event(1000.2, EV_ABS, ABS_MT_POSITION_X, 400), _event(1000.2, EV_ABS, ABS_MT_POSITION_Y, 240),
+                    _event(1000.2, EV_SYN, 0, 0),
+                    _event(1000.22, EV_ABS, ABS_MT_POSITION_X, 480), _event(1000.22, EV_SYN, 0, 0),
+                    _event(1000.25, EV_ABS, ABS_MT_TRACKING_ID, -1), _event(1000.25, EV_SYN, 0, 0)]
+    assert _replay(taps, SINGLE_AND_DOUBLE) == [('single', 0.25)]
+
+
+def test_history_is_bounded_by_the_highest_bound_tap_count():
+    taps = _Taps().tap(1000.0).tap(1000.2).tap(1000.4)
+    listener = InputListener(None, replay=True, config={
+        'control': {'enabled': False},
+        'gestures': {'tap': {'enabled': True, 'interval': INTERVAL, 'bindings': SINGLE_AND_DOUBLE}},
+    })
+    assert listener.gestures[0].history.maxlen == 2
+    listener.replay(taps.events)
+    # The third tap starts a new chain instead of growing the first one
+    assert [(action, round(t - 1000.0, 3)) for action, t, _ in listener.detections] == [
+        ('double', 0.25), ('single', 0.75)]
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from actions.throttle import ActionThrottle
+from utils.clock import Scheduler, VirtualClock
+
+
+def _throttle(**config):
+    scheduler = Scheduler(VirtualClock())
+    executions = []
+    throttle = ActionThrottle('action', config, scheduler,
+                              lambda name, count: executions.append((round(scheduler.now(), 3), count)))
+    return throttle, scheduler, executions
+
+
+def _submit_at(throttle, scheduler, times):
+    for t in times:
+        scheduler.run_until(t)
+        throttle.submit()
+        _assert_invariant(throttle)
+
+
+def _assert_invariant(throttle):
+    stats = throttle.stats()
+    assert stats['triggered'] == stats['executed'] + stats['merged'] + stats['dropped'] + stats['pending']
+
+
+def test_min_interval_drops_triggers_that_come_too_soon():
+    throttle, scheduler, executions = _throttle(min_interval=0.5)
+    _submit_at(throttle, scheduler, [0.0, 0.1, 0.4, 0.6])
+    assert executions == [(0.0, 1), (0.6, 1)]
+    assert throttle.stats() == {'triggered': 4, 'executed': 2, 'merged': 0, 'dropped': 2, 'pending': 0}
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    throttle, scheduler, executions = _throttle(rate=2, burst=3)
+    _submit_at(throttle, scheduler, [0.0, 0.0, 0.0, 0.0, 0.25, 0.5])
+    assert executions == [(0.0, 1), (0.0, 1), (0.0, 1), (0.5, 1)]
+    assert throttle.dropped == 2
+
+
+def test_coalesce_runs_the_first_trigger_and_merges_the_rest_into_one_execution():
+    throttle, scheduler, executions = _throttle(coalesce=0.1)
+    _submit_at(throttle, scheduler, [0.0, 0.02, 0.05, 0.08])
+    assert throttle.pending == 3
+    # The window re-opens after a flush that ran something, so this one is merged too
+    _submit_at(throttle, scheduler, [0.15])
+    scheduler.run_until(1.0)
+    _submit_at(throttle, scheduler, [1.0])
+    scheduler.run_until(2.0)
+    assert executions == [(0.0, 1), (0.1, 3), (0.2, 1), (1.0, 1)]
+    assert throttle.stats() == {'triggered': 6, 'executed': 4, 'merged': 2, 'dropped': 0, 'pending': 0}
+
+
+def test_coalesced_execution_rejected_by_the_rate_drops_its_whole_count():
+    throttle, scheduler, executions = _throttle(coalesce=0.1, rate=1, burst=1)
+    _submit_at(throttle, scheduler, [0.0, 0.03, 0.06])
+    scheduler.run_until(1.0)
+    assert executions == [(0.0, 1)]
+    assert throttle.dropped == 2
+    _assert_invariant(throttle)
+
+
+def test_min_interval_applies_to_the_coalesced_execution():
+    throttle, scheduler, executions = _throttle(coalesce=0.1, min_interval=0.05)
+    _submit_at(throttle, scheduler, [0.0, 0.01])
+    scheduler.run_until(1.0)
+    assert executions == [(0.0, 1), (0.1, 1)]
+    _assert_invariant(throttle)
+
+
+def test_cancel_drops_pending_triggers():
+    throttle, scheduler, executions = _throttle(coalesce=0.1)
+    _submit_at(throttle, scheduler, [0.0, 0.01, 0.02])
+    throttle.cancel()
+    scheduler.run_until(1.0)
+    assert executions == [(0.0, 1)]
+    assert throttle.stats() == {'triggered': 3, 'executed': 1, 'merged': 0, 'dropped': 2, 'pending': 0}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_counters_always_add_up(seed):
+    rng = random.Random(seed)
+    throttle, scheduler, executions = _throttle(min_interval=0.03, rate=8, burst=2, coalesce=0.05)
+    t = 0.0
+    for _ in range(500):
+        t += rng.expovariate(40)
+        _submit_at(throttle, scheduler, [t])
+    scheduler.run_until(t + 1.0)
+    _assert_invariant(throttle)
+    assert throttle.pending == 0
+    assert sum(count for _, count in executions) == throttle.executed + throttle.merged
@@ -0,0 +1,43 @@
+import sys
+import types
+
+from actions.xtest import XTestPointer
+
+
+class FakeDisplay:
+    def __init__(self, requests):
+        self.requests = requests
+
+    def has_extension(self, name):
+        return name == 'XTEST'
+
+    def get_display_name(self):
+        return ':0'
+
+    def flush(self):
+        self.requests.append('flush')
+
+    def close(self):
+        self.requests.append('close')
+
+
+def _fake_xlib(monkeypatch, requests):
+    xlib = types.ModuleType('Xlib')
+    xlib.X = types.SimpleNamespace(ButtonPress=4, ButtonRelease=5)
+    xlib.display = types.SimpleNamespace(Display=lambda: FakeDisplay(requests))
+    ext = types.ModuleType('Xlib.ext')
+    ext.xtest = types.SimpleNamespace(
+        fake_input=lambda display, event, button: requests.append(('press' if event == 4 else 'release', button)))
+    xlib.ext = ext
+    monkeypatch.setitem(sys.modules, 'Xlib', xlib)
+    monkeypatch.setitem(sys.modules, 'Xlib.ext', ext)
+
+
+def test_each_batch_reaches_the_server_when_it_is_sent(monkeypatch):
+    requests = []
+    _fake_xlib(monkeypatch, requests)
+    pointer = XTestPointer()
+    pointer.click(5, 2)
+    assert requests == [('press', 5), ('release', 5), ('press', 5), ('release', 5), 'flush']
+    pointer.click(4)
+    assert requests[-3:] == [('press', 4), ('release', 4), 'flush']
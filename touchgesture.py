@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 
+import time
+STARTED = time.perf_counter()
+
 import os
 import sys
 import argparse
 import logging
 from input.listener import InputListener
 from utils.logging_utils import setup_logging
-from utils.device_utils import list_devices
+from utils.config import load_config
+from utils.profiling import SamplingProfiler, StartupTimer
 
 def get_config_path():
     """Get the appropriate config file path"""
@@ -27,26 +31,84 @@ def get_config_path():
     
     raise FileNotFoundError("No configuration file found")
 
+def apply_latency_args(config, args):
+    """Fold latency command-line flags into the config's latency: section"""
+    latency = dict(config.get('latency') or {})
+    if args.realtime is not None:
+        latency['realtime'] = True
+        latency['priority'] = args.realtime
+    if args.nice is not None:
+        latency['nice'] = args.nice
+    if args.cpus:
+        latency['cpus'] = [int(cpu) for cpu in args.cpus.split(',')]
+    if args.lock_memory:
+        latency['lock_memory'] = True
+    if args.gc:
+        latency['gc'] = dict(latency.get('gc') or {}, mode=args.gc)
+    config['latency'] = latency
+
 def main():
     parser = argparse.ArgumentParser(description='TouchGesture - Touchscreen Gesture Detection')
     parser.add_argument('--config', '-c', help='Path to configuration file')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
     parser.add_argument('--list-devices', '-ls', action='store_true', help='list devices')
+    parser.add_argument('--replay', metavar='CAPTURE', help='Replay a recorded capture file in virtual time and exit')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time each pipeline stage and log a cost table on exit (toggle at runtime with SIGUSR1)')
+    parser.add_argument('--profile-samples', metavar='FILE',
+                        help='With --replay, sample the replay and write collapsed stacks for flamegraph tools')
+    latency_group = parser.add_argument_group('latency', 'override the latency: section of the configuration')
+    latency_group.add_argument('--realtime', metavar='PRIORITY', type=int, nargs='?', const=10,
+                         help='Run the event loop under SCHED_FIFO (default priority 10), or nice if not permitted')
+    latency_group.add_argument('--nice', type=int, help='Nice value for the event loop')
+    latency_group.add_argument('--cpus', metavar='LIST', help='Pin the event loop to these CPUs, e.g. 2,3')
+    latency_group.add_argument('--lock-memory', action='store_true', help='Lock all memory with mlockall()')
+    latency_group.add_argument('--gc', choices=['default', 'tuned', 'disabled'], help='Garbage collection mode in the loop')
+    parser.add_argument('--no-config-cache', action='store_true',
+                        help='Always parse the YAML configuration instead of using the parsed-config cache')
     args = parser.parse_args()
 
     if args.list_devices:
+        # evdev is imported only when devices are actually needed
+        from utils.device_utils import list_devices
         list_devices(args.verbose)
         return
 
+    startup = StartupTimer(STARTED)
+    startup.mark('imports')
     try:
-        setup_logging(args.verbose, '/tmp/touchgesture.log')
         config_path = args.config if args.config else get_config_path()
+        config = load_config(config_path, cache=not args.no_config_cache)
+        startup.mark('config')
+        # Logging is configured exactly once, from the loaded configuration
+        log_file = (config.get('debug') or {}).get('log_file', '/var/log/touchgesture.log')
+        setup_logging(args.verbose, log_file, config=config.get('logging'))
         logging.info(f"Using configuration from: {config_path}")
+        apply_latency_args(config, args)
+        budget = (config.get('startup') or {}).get('budget_ms')
+        startup.budget = budget / 1000.0 if budget else None
+        startup.mark('logging')
+
+        if args.replay:
+            listener = InputListener(config_path, verbose=args.verbose, replay=True, profile=args.profile,
+                                     config=config)
+            sampler = SamplingProfiler() if args.profile_samples else None
+            if sampler:
+                sampler.start()
+            try:
+                listener.replay_file(args.replay)
+            finally:
+                if sampler:
+                    sampler.stop()
+                    sampler.write_collapsed(args.profile_samples)
+            # One line per action on stdout, so two replays can be diffed
+            for action, timestamp, count in listener.detections:
+                print(f"{timestamp:.6f} {action} {count}")
+            return
 
-        if args.verbose:
-            list_devices(args.verbose)
-        
-        listener = InputListener(config_path, verbose=args.verbose)
+        # Verbose device listing happens in the listener's device scan, not in a second pass here
+        listener = InputListener(config_path, verbose=args.verbose, profile=args.profile, config=config,
+                                 startup=startup)
         logging.info("Starting TouchGesture daemon...")
         listener.start()
     except FileNotFoundError as e:
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import argparse
+from input.control import send_request, DEFAULT_SOCKET
+from actions.bus import BusSubscriber, DEFAULT_BUS_SOCKET, KIND_NAMES
+
+def listen(args):
+    """Print gesture bus events until interrupted"""
+    kinds = [kind for kind, name in KIND_NAMES.items() if name in args.kind] if args.kind else None
+    try:
+        subscriber = BusSubscriber(args.bus, kinds=kinds, actions=args.action)
+    except OSError as e:
+        print(f"Cannot reach the gesture bus at {args.bus}: {e}", file=sys.stderr)
+        sys.exit(1)
+    with subscriber:
+        try:
+            while True:
+                event = subscriber.recv()
+                line = f"{event.timestamp:.3f} {KIND_NAMES.get(event.kind, event.kind)} {event.action}"
+                if event.x or event.y:
+                    line += f" {event.x:.1f} {event.y:.1f}"
+                if subscriber.missed:
+                    line += f" (missed {subscriber.missed})"
+                print(line, flush=True)
+        except KeyboardInterrupt:
+            pass
+
+def main():
+    parser = argparse.ArgumentParser(description='TouchGesture - Runtime control')
+    parser.add_argument('--socket', '-s', default=DEFAULT_SOCKET, help='Control socket path')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    sub.add_parser('status', help='Show live finger count, grab state, timers and active gestures')
+    sub.add_parser('counters', help='Show pipeline counters')
+    level = sub.add_parser('log-level', help='Change the log level')
+    level.add_argument('level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'debug', 'info', 'warning', 'error'])
+    trace = sub.add_parser('trace', help='Set the trace level (0 off, 1 gestures, 2 events)')
+    trace.add_argument('level', type=int, choices=[0, 1, 2])
+    dump = sub.add_parser('trace-dump', help='Dump the trace ring buffer')
+    dump.add_argument('--limit', '-n', type=int, help='Only the most recent N entries')
+    dump.add_argument('--clear', action='store_true', help='Clear the buffer after dumping')
+    capture = sub.add_parser('capture', help='Record raw input to a file for the next N seconds')
+    capture.add_argument('seconds', type=float)
+    capture.add_argument('path', nargs='?', help='Capture file (default: /tmp/touchgesture-<time>.tgcap)')
+    profile = sub.add_parser('profile', help='Turn pipeline profiling on or off')
+    profile.add_argument('state', choices=['on', 'off'])
+    bus = sub.add_parser('listen', help='Print gestures published on the gesture bus')
+    bus.add_argument('--bus', default=DEFAULT_BUS_SOCKET, help='Gesture bus socket path')
+    bus.add_argument('--kind', action='append', choices=list(KIND_NAMES.values()),
+                     help='Only these event kinds (repeatable)')
+    bus.add_argument('--action', action='append', help='Only these actions (repeatable)')
+    args = parser.parse_args()
+
+    if args.cmd == 'listen':
+        listen(args)
+        return
+
+    request = {'cmd': args.cmd}
+    if args.cmd in ('log-level', 'trace'):
+        request['level'] = args.level
+    elif args.cmd == 'trace-dump':
+        request.update(limit=args.limit, clear=args.clear)
+    elif args.cmd == 'capture':
+        request.update(seconds=args.seconds, path=args.path)
+    elif args.cmd == 'profile':
+        request['enabled'] = args.state == 'on'
+
+    try:
+        response = send_request(args.socket, request)
+    except OSError as e:
+        print(f"Cannot reach TouchGesture at {args.socket}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.cmd == 'profile' and response.get('report'):
+        print(response.pop('report'))
+    print(json.dumps(response, indent=2))
+    if not response.get('ok'):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
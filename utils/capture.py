@@ -0,0 +1,67 @@
+import struct
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+CAPTURE_MAGIC = b'TGCAP\x00\x01\x00'
+# sec (int64), usec (uint32), type (uint16), code (uint16), value (int32)
+RECORD = struct.Struct('<qIHHi')
+
+
+class CaptureEvent(NamedTuple):
+    """Recorded input event, attribute-compatible with evdev.InputEvent"""
+    sec: int
+    usec: int
+    type: int
+    code: int
+    value: int
+
+    def timestamp(self) -> float:
+        return self.sec + self.usec / 1000000.0
+
+
+class CaptureWriter:
+    """Append input events to a binary capture file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: BinaryIO = open(path, 'wb')
+        self._file.write(CAPTURE_MAGIC)
+        self.count = 0
+
+    def write(self, event):
+        self._file.write(RECORD.pack(event.sec, event.usec, event.type, event.code, event.value))
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_capture(path: str) -> Iterator[CaptureEvent]:
+    """Yield events from a capture file written by CaptureWriter
+
+    Args:
+        path (str): Path to the capture file
+
+    Returns:
+        Iterator[CaptureEvent]: Recorded events in file order
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"Not a TouchGesture capture file: {path}")
+        data = f.read()
+    usable = len(data) - len(data) % RECORD.size
+    for fields in RECORD.iter_unpack(data[:usable]):
+        yield CaptureEvent(*fields)
+
+
+def write_capture(path: str, events: Iterable) -> int:
+    """Write a sequence of events to a capture file, returning the count"""
+    with CaptureWriter(path) as writer:
+        for event in events:
+            writer.write(event)
+        return writer.count
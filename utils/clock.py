@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class MonotonicClock:
+    """Clock backed by time.monotonic(), immune to wall-clock jumps"""
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def advance_to(self, timestamp: float):
+        """Real time cannot be advanced; present for interface parity"""
+        pass
+
+
+class VirtualClock:
+    """Clock that only moves when told to, e.g. by recorded event timestamps"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    def advance_to(self, timestamp: float):
+        """Move the clock forward; time never runs backwards"""
+        if timestamp > self._now:
+            self._now = timestamp
+
+
+class TimerHandle:
+    """A pending scheduler callback that can be cancelled"""
+
+    __slots__ = ('deadline', 'callback', 'cancelled')
+
+    def __init__(self, deadline: float, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Single-threaded timer queue driven by the event loop
+
+    Replaces per-gesture threading.Timer objects. The live loop uses
+    timeout() as its select() timeout and calls run_due() afterwards;
+    replay calls run_until() with each event timestamp, so deadlines fire
+    at exactly the same virtual instants on every run.
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else MonotonicClock()
+        self._queue: List[Tuple[float, int, TimerHandle]] = []
+        self._sequence = itertools.count()
+
+    def now(self) -> float:
+        return self.clock.now()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        """Schedule callback to run delay seconds from now"""
+        return self.call_at(self.clock.now() + delay, callback)
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> TimerHandle:
+        """Schedule callback to run at an absolute clock time"""
+        handle = TimerHandle(deadline, callback)
+        heapq.heappush(self._queue, (deadline, next(self._sequence), handle))
+        return handle
+
+    def next_deadline(self) -> Optional[float]:
+        """Return the earliest pending deadline, discarding cancelled timers"""
+        while self._queue and self._queue[0][2].cancelled:
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
+    def timeout(self) -> Optional[float]:
+        """Seconds until the next deadline, suitable for select(); None if idle"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.clock.now())
+
+    def run_until(self, timestamp: float) -> int:
+        """Fire every timer due at or before timestamp, in deadline order
+
+        The clock is advanced to each deadline before its callback runs, so
+        callbacks observe the instant they were scheduled for. Returns the
+        number of callbacks executed.
+        """
+        fired = 0
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > timestamp:
+                break
+            _, _, handle = heapq.heappop(self._queue)
+            self.clock.advance_to(deadline)
+            handle.callback()
+            fired += 1
+        self.clock.advance_to(timestamp)
+        return fired
+
+    def run_due(self) -> int:
+        """Fire every timer whose deadline has passed on the clock"""
+        return self.run_until(self.clock.now())
+
+    def pending(self) -> int:
+        """Number of live (non-cancelled) timers"""
+        return sum(1 for _, _, handle in self._queue if not handle.cancelled)
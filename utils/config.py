@@ -0,0 +1,84 @@
+import os
+import hashlib
+import logging
+import marshal
+from typing import Any, Dict, Optional, Tuple
+
+# Bump when the cached form changes; older cache files are then ignored
+CACHE_VERSION = 1
+
+
+def config_cache_path(config_path: str) -> str:
+    """Location of the parsed-config cache for a configuration file
+
+    Args:
+        config_path (str): Path to the YAML configuration
+
+    Returns:
+        str: Cache file under $XDG_CACHE_HOME (or ~/.cache)/touchgesture
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    digest = hashlib.sha1(os.path.abspath(config_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_home, 'touchgesture', f"config-{digest}.marshal")
+
+
+def _cache_key(config_path: str) -> Tuple[Any, ...]:
+    stat = os.stat(config_path)
+    return (CACHE_VERSION, os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _read_cache(cache_path: str, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, config = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return config if cached_key == key else None
+
+
+def _write_cache(cache_path: str, key: Tuple[Any, ...], config: Dict[str, Any]):
+    try:
+        data = marshal.dumps((key, config))
+    except ValueError:
+        # e.g. YAML timestamps; such configs are simply parsed every time
+        logging.debug("Configuration holds values the cache cannot store; not caching")
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.debug(f"Cannot write configuration cache {cache_path}: {e}")
+
+
+def load_config(config_path: str, cache: bool = False) -> Dict[str, Any]:
+    """Load configuration from YAML file
+
+    With ``cache``, the parsed configuration is kept in a marshal file keyed
+    by the file's path, mtime and size. An unchanged file is then loaded
+    without importing or running the YAML parser; any edit invalidates it.
+
+    Args:
+        config_path (str): Path to the YAML configuration
+        cache (bool): Whether to use the parsed-config cache
+
+    Returns:
+        Dict[str, Any]: Parsed configuration (empty if the file is empty)
+    """
+    if cache:
+        key = _cache_key(config_path)
+        cache_path = config_cache_path(config_path)
+        config = _read_cache(cache_path, key)
+        if config is not None:
+            logging.debug(f"Loaded configuration from cache {cache_path}")
+            return config
+    # PyYAML is the most expensive import at startup; a cache hit never needs it
+    import yaml
+    with open(config_path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+    logging.debug(f"Loaded configuration: {config}")
+    if cache:
+        _write_cache(cache_path, key, config)
+    return config
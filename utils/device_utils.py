@@ -2,6 +2,24 @@ import evdev
 import logging
 from typing import List, Optional
 
+def scan_devices(verbose: bool = False) -> List[evdev.InputDevice]:
+    """Open every available input device once
+
+    Args:
+        verbose (bool): Whether to enable verbose logging
+
+    Returns:
+        List[evdev.InputDevice]: Devices that could be opened
+    """
+    devices = []
+    for path in evdev.list_devices():
+        try:
+            devices.append(evdev.InputDevice(path))
+        except Exception as e:
+            if verbose:
+                logging.debug(f"Failed to open device {path}: {e}")
+    return devices
+
 def list_devices(verbose: bool = False) -> List[evdev.InputDevice]:
     """List all available input devices
     
@@ -16,45 +34,35 @@ def list_devices(verbose: bool = False) -> List[evdev.InputDevice]:
     else:
         print("Listing devices...")
         
-    devices = []
-    for path in evdev.list_devices():
-        try:
-            dev = evdev.InputDevice(path)
-            devices.append(dev)
-            if verbose:
-                logging.info(f"Device: {dev.path}, {dev.name}, {dev.phys}")
-                logging.debug(f"Device capabilities: {dev.capabilities()}")
-            else:
-                print(f"Device: {dev.path}, {dev.name}, {dev.phys}")
-        except Exception as e:
-            if verbose:
-                logging.debug(f"Failed to open device {path}: {e}")
-            continue
+    devices = scan_devices(verbose)
+    for dev in devices:
+        if verbose:
+            logging.info(f"Device: {dev.path}, {dev.name}, {dev.phys}")
+            logging.debug(f"Device capabilities: {dev.capabilities()}")
+        else:
+            print(f"Device: {dev.path}, {dev.name}, {dev.phys}")
             
     return devices
 
-def find_device_by_name(name: str, verbose: bool = False) -> Optional[evdev.InputDevice]:
+def find_device_by_name(name: str, verbose: bool = False,
+                        devices: Optional[List[evdev.InputDevice]] = None) -> Optional[evdev.InputDevice]:
     """Find input device by name pattern
     
     Args:
         name (str): Name pattern to search for
         verbose (bool): Whether to enable verbose logging
+        devices (Optional[List[evdev.InputDevice]]): Already opened devices to
+            search instead of scanning /dev/input again
         
     Returns:
         Optional[evdev.InputDevice]: Found device or None
     """
-    for device in evdev.list_devices():
-        try:
-            dev = evdev.InputDevice(device)
-            if name.lower() in dev.name.lower():
-                if verbose:
-                    logging.info(f"Found device: {dev.name}")
-                    logging.debug(f"Device capabilities: {dev.capabilities()}")
-                return dev
-        except Exception as e:
+    for dev in devices if devices is not None else scan_devices(verbose):
+        if name.lower() in dev.name.lower():
             if verbose:
-                logging.debug(f"Failed to open device {device}: {e}")
-            continue
+                logging.info(f"Found device: {dev.name}")
+                logging.debug(f"Device capabilities: {dev.capabilities()}")
+            return dev
     return None
 
 def find_device_by_id(event_id: int, verbose: bool = False) -> Optional[evdev.InputDevice]:
@@ -0,0 +1,198 @@
+import gc
+import os
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set
+
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+GC_DEFAULT = 'default'
+GC_TUNED = 'tuned'
+GC_DISABLED = 'disabled'
+
+
+class LatencyTuner:
+    """Apply the ``latency:`` settings to the event loop thread
+
+    Every setting is best effort: a missing privilege or platform feature
+    is logged and reported as not applied, never fatal. Scheduling class,
+    nice value and CPU affinity are per-thread on Linux, so they are
+    applied from the thread running the event loop and leave the logging
+    thread alone. Children started from that thread must not inherit them:
+    the scheduling class is set with SCHED_RESET_ON_FORK, and ``spawning()``
+    puts the original CPU mask back around each spawn.
+
+    GC modes for the hot loop:
+
+    - ``default``: CPython's thresholds
+    - ``tuned``: generation 0 threshold raised to ``threshold`` allocations
+    - ``disabled``: automatic collection off; a full collection runs once
+      the loop has been idle for ``idle_collect`` seconds, or a young one
+      when ``threshold`` allocations pile up during a long busy stretch
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]], scheduler):
+        config = config or {}
+        self.scheduler = scheduler
+        self.realtime = config.get('realtime', False)
+        self.priority = int(config.get('priority', 10))
+        self.nice = config.get('nice')
+        self.cpus: List[int] = [int(cpu) for cpu in config.get('cpus') or []]
+        self.lock_memory = config.get('lock_memory', False)
+        gc_config = config.get('gc') or {}
+        self.gc_freeze = gc_config.get('freeze', True)
+        self.gc_mode = gc_config.get('mode', GC_DEFAULT)
+        self.gc_threshold = int(gc_config.get('threshold', 50000))
+        self.idle_collect = float(gc_config.get('idle_collect', 1.0))
+        self.effective: Dict[str, str] = {}
+        self.realtime_applied = False
+        # CPU mask before pinning; children get it back
+        self.inherited_cpus: Optional[Set[int]] = None
+        self.idle_timer = None
+        self.last_activity = 0.0
+        self.dirty = False
+        self.collections = 0
+
+    def apply(self) -> Dict[str, str]:
+        """Apply all settings; return what actually took effect"""
+        self.effective['scheduling'] = self._apply_scheduling()
+        self.effective['cpus'] = self._apply_affinity()
+        self.effective['memory'] = self._apply_memory_lock()
+        self.effective['gc'] = self._apply_gc()
+        report = ", ".join(f"{k}={v}" for k, v in self.effective.items())
+        logging.info(f"Latency settings: {report}")
+        return self.effective
+
+    def _apply_scheduling(self) -> str:
+        # Children (xdotool, commands, coprocesses) go back to SCHED_OTHER and nice 0
+        reset_on_fork = getattr(os, 'SCHED_RESET_ON_FORK', 0)
+        if self.realtime:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO | reset_on_fork, os.sched_param(self.priority))
+                self.realtime_applied = True
+                return f"SCHED_FIFO/{self.priority}"
+            except (AttributeError, OSError) as e:
+                logging.warning(f"SCHED_FIFO unavailable ({e}), falling back to nice")
+                if self.nice is None:
+                    self.nice = -10
+        if self.nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, int(self.nice))
+            except (AttributeError, OSError) as e:
+                logging.warning(f"Cannot set nice {self.nice}: {e}")
+            if reset_on_fork:
+                try:
+                    os.sched_setscheduler(0, os.SCHED_OTHER | reset_on_fork, os.sched_param(0))
+                except OSError as e:
+                    logging.warning(f"Cannot set SCHED_RESET_ON_FORK, children inherit nice {self.nice}: {e}")
+            return f"nice {os.getpriority(os.PRIO_PROCESS, 0)}"
+        return "default"
+
+    def _apply_affinity(self) -> str:
+        if not self.cpus:
+            return "any"
+        try:
+            inherited = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, self.cpus)
+        except (AttributeError, OSError) as e:
+            logging.warning(f"Cannot pin to CPUs {self.cpus}: {e}")
+            return "any (pinning failed)"
+        self.inherited_cpus = inherited
+        return ",".join(str(cpu) for cpu in sorted(os.sched_getaffinity(0)))
+
+    def spawn_scheduler(self) -> tuple:
+        """``scheduler`` argument for os.posix_spawn: an ordinary SCHED_OTHER child"""
+        return (os.SCHED_OTHER, os.sched_param(0))
+
+    @contextmanager
+    def spawning(self):
+        """Start child processes inside this block so they are not pinned to the loop's CPUs
+
+        A child inherits the spawning thread's CPU mask, and no spawn API
+        resets it without a pre-exec hook (which would rule out vfork), so
+        the loop thread is briefly unpinned instead.
+        """
+        if self.inherited_cpus is None:
+            yield
+            return
+        try:
+            os.sched_setaffinity(0, self.inherited_cpus)
+        except OSError as e:
+            logging.debug(f"Cannot restore CPU mask for a child: {e}")
+        try:
+            yield
+        finally:
+            try:
+                os.sched_setaffinity(0, self.cpus)
+            except OSError as e:
+                logging.warning(f"Cannot re-pin to CPUs {self.cpus}: {e}")
+
+    def _apply_memory_lock(self) -> str:
+        if not self.lock_memory:
+            return "unlocked"
+        import ctypes
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+                error = ctypes.get_errno()
+                logging.warning(f"mlockall failed: {os.strerror(error)} (needs CAP_IPC_LOCK or RLIMIT_MEMLOCK)")
+                return "unlocked (mlockall failed)"
+        except (OSError, AttributeError) as e:
+            logging.warning(f"mlockall unavailable: {e}")
+            return "unlocked (mlockall unavailable)"
+        return "locked"
+
+    def _apply_gc(self) -> str:
+        parts = []
+        if self.gc_freeze:
+            # Objects created during setup (config, recognizers, LUTs) are
+            # long-lived; keep them out of every future collection
+            gc.collect()
+            gc.freeze()
+            parts.append(f"frozen {gc.get_freeze_count()} objects")
+        if self.gc_mode == GC_TUNED:
+            _, gen1, gen2 = gc.get_threshold()
+            gc.set_threshold(self.gc_threshold, gen1, gen2)
+            parts.append(f"gen0 threshold {self.gc_threshold}")
+        elif self.gc_mode == GC_DISABLED:
+            gc.disable()
+            parts.append(f"disabled in loop, collected after {self.idle_collect:g}s idle")
+        else:
+            parts.append("default thresholds")
+        return "; ".join(parts)
+
+    def activity(self):
+        """Called by the loop after each batch of input; schedules idle collection"""
+        if self.gc_mode != GC_DISABLED:
+            return
+        self.dirty = True
+        self.last_activity = self.scheduler.now()
+        if gc.get_count()[0] > self.gc_threshold:
+            gc.collect(0)
+            self.collections += 1
+        if self.idle_timer is None:
+            self.idle_timer = self.scheduler.call_later(self.idle_collect, self._idle)
+
+    def _idle(self):
+        # One timer per idle period: re-armed until input has stopped for idle_collect
+        self.idle_timer = None
+        idle_since = self.scheduler.now() - self.last_activity
+        if idle_since < self.idle_collect:
+            self.idle_timer = self.scheduler.call_later(self.idle_collect - idle_since, self._idle)
+            return
+        if self.dirty:
+            self.dirty = False
+            gc.collect()
+            self.collections += 1
+
+    def close(self):
+        """Restore automatic collection"""
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+        if self.gc_mode == GC_DISABLED:
+            gc.enable()
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.effective, collections=self.collections)
@@ -1,31 +1,197 @@
+import atexit
 import logging
-from systemd.journal import JournalHandler
-import os
-from typing import Optional
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Any, Dict, List, Optional
 
-def setup_logging(verbose: bool = False, log_file: Optional[str] = None, log_level: int = logging.INFO):
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_SINKS = ['console', 'journal', 'file']
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped when full"""
+
+    def __init__(self, record_queue: queue.Queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """Limit how often a single log call site may emit
+
+    Each call site (file and line) may log ``burst`` records per
+    ``interval`` seconds; beyond that only one record in ``sample`` is
+    kept. The first record after a suppressed stretch reports how many
+    records were skipped. Warnings and errors are never limited.
+    """
+
+    def __init__(self, burst: int = 20, interval: float = 1.0, sample: int = 100):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.sample = max(1, sample)
+        # (pathname, lineno) -> [window_start, count_in_window, suppressed]
+        self.sites: Dict[tuple, List[Any]] = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        site = self.sites.get(key)
+        if site is None:
+            self.sites[key] = [now, 1, 0]
+            return True
+        if now - site[0] >= self.interval:
+            skipped = site[2]
+            site[0], site[1], site[2] = now, 1, 0
+            if skipped:
+                record.msg = f"{record.getMessage()} ({skipped} similar messages suppressed)"
+                record.args = None
+            return True
+        site[1] += 1
+        if site[1] <= self.burst or (site[1] - self.burst) % self.sample == 0:
+            return True
+        site[2] += 1
+        self.suppressed += 1
+        return False
+
+
+class _SinkListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room instead of failing on a full queue"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class LoggingRuntime:
+    """Handles of the installed logging pipeline, used for shutdown and counters"""
+
+    def __init__(self, handler: BoundedQueueHandler, listener: _SinkListener,
+                 rate_limit: Optional[RateLimitFilter]):
+        self.handler = handler
+        self.listener = listener
+        self.rate_limit = rate_limit
+
+    def stop(self):
+        """Flush queued records and stop the sink thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self.handler.queue.qsize(),
+            'dropped': self.handler.dropped,
+            'rate_limited': self.rate_limit.suppressed if self.rate_limit else 0,
+        }
+
+
+_runtime: Optional[LoggingRuntime] = None
+
+
+def _build_sinks(sinks: List[str], log_file: Optional[str], problems: List[str]) -> List[logging.Handler]:
+    """Create the configured handlers; sinks that cannot be created are described in problems"""
+    handlers: List[logging.Handler] = []
+    for sink in sinks:
+        if sink == 'console':
+            handlers.append(logging.StreamHandler())
+        elif sink == 'journal':
+            try:
+                # Only imported when configured; python-systemd is optional
+                from systemd.journal import JournalHandler
+                handlers.append(JournalHandler())
+            except ImportError:
+                logging.getLogger(__name__).debug("python-systemd not installed, journal sink disabled")
+        elif sink == 'file':
+            if log_file:
+                try:
+                    handlers.append(logging.FileHandler(log_file))
+                except OSError as e:
+                    problems.append(f"Cannot open log file {log_file}: {e}")
+        else:
+            problems.append(f"Unknown logging sink: {sink}")
+    return handlers
+
+
+def setup_logging(verbose: bool = False, log_file: Optional[str] = None, log_level: int = logging.INFO,
+                  config: Optional[Dict[str, Any]] = None) -> LoggingRuntime:
     """Centralized logging setup function
-    
+
+    Records are formatted on the calling thread, passed through a bounded
+    queue and written by a background sink thread, so a slow journald or
+    disk never stalls event processing. Calling it again replaces the
+    previous pipeline.
+
     Args:
         verbose (bool): Whether to enable verbose logging
-        log_file (str, optional): Path to log file. If None, logs to stdout only
+        log_file (str, optional): Path to log file, used when the 'file' sink is enabled
         log_level (int): Logging level to use
+        config (dict, optional): The ``logging:`` config section (sinks, file,
+            queue_size, rate_limit)
+
+    Returns:
+        LoggingRuntime: Handles for shutdown and drop/rate-limit counters
     """
-    log_format = '%(asctime)s - %(levelname)s - %(message)s'
-    
-    handlers = [logging.StreamHandler()]
-    handlers.append(JournalHandler())
-    if log_file:
-        handlers.append(logging.FileHandler(log_file))
-    
+    global _runtime
+    config = config or {}
+    log_file = config.get('file', log_file)
+    sinks = config.get('sinks', DEFAULT_SINKS)
+
     if verbose:
         log_level = logging.DEBUG
-    
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=handlers
-    )
-    
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    problems: List[str] = []
+    handlers = _build_sinks(sinks, log_file, problems)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    record_queue: queue.Queue = queue.Queue(maxsize=int(config.get('queue_size', 10000)))
+    queue_handler = BoundedQueueHandler(record_queue)
+    rate_limit = None
+    rate_config = config.get('rate_limit', {})
+    if rate_config is not None and rate_config.get('enabled', True):
+        rate_limit = RateLimitFilter(int(rate_config.get('burst', 20)),
+                                     float(rate_config.get('interval', 1.0)),
+                                     int(rate_config.get('sample', 100)))
+        queue_handler.addFilter(rate_limit)
+
+    if _runtime is not None:
+        _runtime.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(log_level)
+
+    listener = _SinkListener(record_queue, *handlers)
+    listener.start()
+    _runtime = LoggingRuntime(queue_handler, listener, rate_limit)
+    atexit.register(_runtime.stop)
+
+    # Reported through the sinks that did come up (console, journald), never stdout
+    for problem in problems:
+        if handlers:
+            logging.warning(problem)
+        else:
+            print(problem, file=sys.stderr)
     if verbose:
-        logging.debug("Verbose logging enabled") 
\ No newline at end of file
+        logging.debug("Verbose logging enabled")
+    return _runtime
+
+
+def logging_stats() -> Dict[str, int]:
+    """Queue depth, dropped and rate-limited record counts of the active pipeline"""
+    if _runtime is None:
+        return {}
+    return _runtime.stats()
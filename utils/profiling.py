@@ -0,0 +1,129 @@
+import os
+import signal
+import time
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+class StageProfiler:
+    """Cheap per-stage wall/CPU accounting for the event pipeline
+
+    Call sites check ``enabled`` before touching the clocks, so a disabled
+    profiler costs one attribute read per stage.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # stage -> [calls, wall_ns, cpu_ns]
+        self.stages: Dict[str, List[int]] = {}
+
+    def toggle(self) -> bool:
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def reset(self):
+        self.stages = {}
+
+    @staticmethod
+    def start() -> Tuple[int, int]:
+        """Take a (wall, cpu) timestamp pair for a stage about to run"""
+        return time.perf_counter_ns(), time.thread_time_ns()
+
+    def stop(self, stage: str, started: Tuple[int, int]):
+        """Charge the time since started to stage"""
+        wall = time.perf_counter_ns() - started[0]
+        cpu = time.thread_time_ns() - started[1]
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, wall, cpu]
+        else:
+            entry[0] += 1
+            entry[1] += wall
+            entry[2] += cpu
+
+    def report(self) -> str:
+        """Format the per-stage cost table, most expensive stage first"""
+        total_wall = sum(entry[1] for entry in self.stages.values()) or 1
+        lines = [f"{'stage':<32} {'calls':>10} {'wall ms':>10} {'cpu ms':>10} {'us/call':>9} {'wall %':>7}"]
+        for stage, (calls, wall, cpu) in sorted(self.stages.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{stage:<32} {calls:>10} {wall / 1e6:>10.2f} {cpu / 1e6:>10.2f} "
+                         f"{wall / calls / 1e3:>9.2f} {100.0 * wall / total_wall:>6.1f}%")
+        return "\n".join(lines)
+
+    def log_report(self):
+        if self.stages:
+            logging.info("Pipeline profile:\n" + self.report())
+
+
+class StartupTimer:
+    """Wall-clock breakdown of daemon startup up to "ready to read events"
+
+    Each ``mark`` charges the time since the previous one to the named
+    stage, so stages must be marked in the order they run.
+    """
+
+    def __init__(self, started: Optional[float] = None, budget: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.budget = budget  # seconds; exceeding it is logged as a warning
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def total(self) -> float:
+        return self.last - self.started
+
+    def report(self) -> str:
+        parts = ", ".join(f"{stage} {seconds * 1e3:.1f}" for stage, seconds in self.stages)
+        return f"{parts} = {self.total() * 1e3:.1f} ms"
+
+    def log_report(self):
+        logging.info(f"Startup: {self.report()}")
+        if self.budget is not None and self.total() > self.budget:
+            logging.warning(f"Startup took {self.total() * 1e3:.0f} ms, over the "
+                            f"{self.budget * 1e3:.0f} ms budget")
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling the main thread's stack on ITIMER_PROF
+
+    Stacks are aggregated in memory and written in the collapsed format
+    ("frame;frame;frame count") read by flamegraph.pl, speedscope and
+    inferno. Must be started from the main thread.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._previous_handler = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+
+    def write_collapsed(self, path: str) -> int:
+        """Write collapsed stacks to path, returning the number of samples"""
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+        total = sum(self.samples.values())
+        logging.info(f"Wrote {total} samples ({len(self.samples)} unique stacks) to {path}")
+        return total
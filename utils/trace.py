@@ -0,0 +1,31 @@
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+TRACE_OFF = 0
+TRACE_GESTURES = 1  # recognitions and executed actions
+TRACE_EVENTS = 2    # additionally every conditioned input event
+
+
+class TraceRing:
+    """Fixed-size ring buffer of recent pipeline activity
+
+    Recording is a single deque append, and callers check ``level`` first,
+    so tracing can stay compiled in and be raised on a live daemon.
+    """
+
+    def __init__(self, size: int = 4096, level: int = TRACE_OFF):
+        self.level = level
+        self.entries = deque(maxlen=size)
+
+    def record(self, timestamp: float, kind: str, detail: Any):
+        self.entries.append((timestamp, kind, detail))
+
+    def dump(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the most recent entries, oldest first"""
+        entries = list(self.entries)
+        if limit is not None:
+            entries = entries[-limit:]
+        return [{'time': timestamp, 'kind': kind, 'detail': detail} for timestamp, kind, detail in entries]
+
+    def clear(self):
+        self.entries.clear()